@@ -4,6 +4,7 @@ from utils.firebase_helper import (
     get_skills, get_education,
     add_education, add_applicant
 )
+from utils.validation import validate_applicant, WORK_MODES, WORK_DURATIONS, SOURCES
 
 COUNTRY_CODES = {
     "India (+91)": "+91",
@@ -116,14 +117,14 @@ def form(data={}):
     State = st.text_input("Current State", value=data.get("state","") if data else "")
     Country = st.text_input("Current Country", value=data.get("country","India") if data else "India")
 
-    current_mode = st.selectbox("Current Work Mode", ["Onsite", "Remote", "Hybrid"], index=["Onsite","Remote","Hybrid"].index(data.get("current_mode","Onsite")) if data else 0)
-    current_dur = st.selectbox("Current Work Duration", ["Full Time", "Contractual"], index=["Full Time","Contractual"].index(data.get("current_duration","Full Time")) if data else 0)
-    preferred_mode = st.selectbox("Preferred Work Mode", ["Onsite", "Remote", "Hybrid"], index=["Onsite","Remote","Hybrid"].index(data.get("preferred_mode","Onsite")) if data else 0)
-    preferred_dur = st.selectbox("Preferred Work Duration", ["Full Time", "Contractual"], index=["Full Time","Contractual"].index(data.get("preferred_duration","Full Time")) if data else 0)
+    current_mode = st.selectbox("Current Work Mode", WORK_MODES, index=WORK_MODES.index(data.get("current_mode","Onsite")) if data else 0)
+    current_dur = st.selectbox("Current Work Duration", WORK_DURATIONS, index=WORK_DURATIONS.index(data.get("current_duration","Full Time")) if data else 0)
+    preferred_mode = st.selectbox("Preferred Work Mode", WORK_MODES, index=WORK_MODES.index(data.get("preferred_mode","Onsite")) if data else 0)
+    preferred_dur = st.selectbox("Preferred Work Duration", WORK_DURATIONS, index=WORK_DURATIONS.index(data.get("preferred_duration","Full Time")) if data else 0)
 
     # 🔹 ADDITIONAL APPLICATION DETAILS
     st.header("📌 Application Details")
-    source = st.selectbox("Source", ["Job Site", "Referral", "Social Media"], index=["Job Site","Referral","Social Media"].index(data.get("source","Job Site")) if data else 0)
+    source = st.selectbox("Source", SOURCES, index=SOURCES.index(data.get("source","Job Site")) if data else 0)
     total_exp = st.number_input(
         "Total Years of Experience",
         value=float(data.get("experience", 0)),
@@ -211,8 +212,7 @@ def app():
 
         if submitted:
             # Validation
-            required = [data.get("name"), data.get("phone"), data.get("email"), data.get("skills"), data.get("course"), data.get("specialization"), data.get("institute"), resume]
-            if not all(required):
+            if validate_applicant(data) or not resume:
                 st.warning("Please fill in all required fields.")
             else:
                 # Persist new options
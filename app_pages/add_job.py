@@ -1,5 +1,6 @@
 import streamlit as st
 from utils.firebase_helper import get_skills, add_job, get_clients
+from utils.validation import validate_job, WORK_MODES, JOB_DURATIONS
 
 def app():
     if not st.session_state.get("logged_in", False):
@@ -36,7 +37,7 @@ def app():
             job_title = st.text_input("Job Title *")
             department = st.text_input("Department")
             location = st.text_input("Job Location")
-            work_mode = st.selectbox("Work Mode *", ["Onsite", "Remote", "Hybrid"])
+            work_mode = st.selectbox("Work Mode *", WORK_MODES)
             vacancies = st.number_input("Vacancies *", min_value=1, step=1)
             client = st.selectbox(
                 "Client Name (if applicable)",
@@ -69,7 +70,7 @@ def app():
         )
         job_duration = st.selectbox(
             "Job Duration",
-            options=["Full Time", "Contractual (6+6)", "Contractual (1 year )", "Internship"],
+            options=JOB_DURATIONS,
             help="Select the type of job duration."
         )
         st.markdown('</section>', unsafe_allow_html=True)
@@ -84,8 +85,8 @@ def app():
         submitted = st.form_submit_button("Submit Job Opening")
 
         if submitted:
-            required_fields = [job_title, work_mode, required_skills, vacancies]
-            if not all(required_fields):
+            required_fields = {"job_title": job_title, "work_mode": work_mode, "skills": required_skills, "vacancies": vacancies}
+            if validate_job(required_fields):
                 st.warning("Please complete all required fields marked with *.")
             else:
                 # Assemble stages
@@ -34,5 +34,8 @@ def app():
         
         # ✅ Hash and save
         pw_hash = hash_password(new_password)
-        save_user(new_username, pw_hash)
+        if not save_user(new_username, pw_hash):
+            # Registered by someone else since the check above
+            st.error("⚠️ Username already exists. Try another.")
+            return
         st.success(f"✅ User `{new_username}` added successfully!")
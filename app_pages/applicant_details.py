@@ -25,8 +25,7 @@ def render_stepper(stages: list[str], current_stage: str):
             cols[i*2 +1].markdown("➡️", unsafe_allow_html=True)
 
 
-def render_app_card(app_id, app_data):
-    job_data = get_jobs([app_data["job_id"]]).get(app_data["job_id"], {})
+def render_app_card(app_id, app_data, job_data):
     stages = job_data.get("hiring_process", [])
     current = app_data.get("status", stages[0] if stages else "applied")
     rejected = app_data.get("rejected", "false") == "true"
@@ -38,33 +37,33 @@ def render_app_card(app_id, app_data):
     if not rejected:
         if current == "Selected":
             if col1.button("Offer Made", key=f"offer_{app_id}"):
-                update_application_status(app_id, "offer")
+                update_application_status(app_id, "offer", current=app_data)
                 st.warning("Offer made! Please update the status accordingly.")
                 st.rerun()
             if col2.button("❌ Reject", key=f"rej_{app_id}"):
-                reject_application(app_id, "true")
+                reject_application(app_id, "true", current=app_data)
                 st.rerun()
         else:
             if col1.button("➡️ Advance", key=f"adv_{app_id}"):
                 next_idx = min(stages.index(current) + 1, len(stages) - 1)
-                update_application_status(app_id, stages[next_idx])
+                update_application_status(app_id, stages[next_idx], current=app_data)
                 st.rerun()
             if col2.button("❌ Reject", key=f"rej_{app_id}"):
-                reject_application(app_id, "true")
+                reject_application(app_id, "true", current=app_data)
                 st.rerun()
     else:
         st.markdown("❌ **Applicant has been rejected.**")
         if col1.button("➡️ Advance anyway", key=f"adv_{app_id}"):
             next_idx = min(stages.index(current) + 1, len(stages) - 1)
-            reject_application(app_id, "false")
-            update_application_status(app_id, stages[next_idx])
+            reject_application(app_id, "false", current=app_data)
+            update_application_status(app_id, stages[next_idx], current={**app_data, "rejected": "false"})
             st.rerun()
         if col2.button("✅ Revert to Applied", key=f"revert_{app_id}"):
-            reject_application(app_id, "false")
-            update_application_status(app_id, "applied")
+            reject_application(app_id, "false", current=app_data)
+            update_application_status(app_id, "applied", current={**app_data, "rejected": "false"})
             st.rerun()
     if col3.button("🗑️ Delete", key=f"del_{app_id}"):
-        delete_application(app_id)
+        delete_application(app_id, current=app_data)
         st.rerun()
     st.markdown("---")
 
@@ -202,9 +201,12 @@ def app():
             st.write("No applications found.")
             return
 
+        # Look up every referenced job at once and share it across cards
+        jobs = get_jobs([ad["job_id"] for ad in apps.values()])
+
         # Render all application cards
         for aid, ad in apps.items():
-            render_app_card(aid, ad)
+            render_app_card(aid, ad, jobs.get(ad["job_id"], {}))
 
 
     
@@ -1,6 +1,6 @@
 import streamlit as st
 import plotly.express as px
-from utils.firebase_helper import get_clients, get_open_jobs, get_applicants, get_vacancies
+from utils.firebase_helper import get_aggregates
 
 def app():
     
@@ -41,11 +41,14 @@ def app():
     """, unsafe_allow_html=True)
 
 
-    # Fetch data
-    total_clients = len(get_clients())
-    total_applicants = len(get_applicants())
-    total_job_posts = len(get_open_jobs())
-    total_vacancies, vacancies_by_dept, vacancies_by_mode = get_vacancies(breakdown=True)
+    # Fetch the materialized aggregates
+    aggregates = get_aggregates()
+    total_clients = aggregates.get("clients", 0)
+    total_applicants = aggregates.get("applicants", 0)
+    total_job_posts = aggregates.get("open_jobs", 0)
+    total_vacancies = aggregates.get("vacancies", 0)
+    vacancies_by_dept = aggregates["vacancies_by_department"]
+    vacancies_by_mode = aggregates["vacancies_by_mode"]
 
     # Layout: 4 columns for metrics
     cols = st.columns(4)
@@ -0,0 +1,77 @@
+import hashlib
+import os
+import pandas as pd
+import streamlit as st
+from utils.importer import import_file, count_rows, openpyxl
+
+# Uploads are saved under their content hash so that uploading the same
+# file again resumes the earlier import from its checkpoint.
+IMPORT_DIR = os.environ.get("import_dir", "imports")
+
+
+def _save_upload(uploaded):
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: uploaded.read(1 << 20), b""):
+        digest.update(chunk)
+    extension = os.path.splitext(uploaded.name)[1].lower()
+    path = os.path.join(IMPORT_DIR, f"{digest.hexdigest()}{extension}")
+    if not os.path.exists(path):
+        os.makedirs(IMPORT_DIR, exist_ok=True)
+        uploaded.seek(0)
+        tmp_path = f"{path}.part"
+        with open(tmp_path, "wb") as f:
+            for chunk in iter(lambda: uploaded.read(1 << 20), b""):
+                f.write(chunk)
+        os.replace(tmp_path, path)
+    return path
+
+
+def app():
+    # 🛑 Login guard
+    if not st.session_state.get("logged_in", False):
+        st.error("🚫 You must be logged in.")
+        st.stop()
+
+    st.title("📥 Import Data")
+    st.write(
+        "Upload a CSV or Excel file with one record per row and a header row. "
+        "Skills are written as `Python: 2; SQL: 1` for applicants and `Python; SQL` for jobs."
+    )
+
+    kind = st.radio("Import", ["applicants", "jobs"], horizontal=True, format_func=str.title)
+    types = ["csv", "xlsx"] if openpyxl else ["csv"]
+    uploaded = st.file_uploader("File", type=types)
+    restart = st.checkbox("Start over (ignore progress from an earlier upload of this file)")
+
+    if not uploaded or not st.button("Import", type="primary"):
+        return
+
+    path = _save_upload(uploaded)
+    total = count_rows(path)
+    bar = st.progress(0.0)
+    status = st.empty()
+
+    def report(rows_done, imported, errors):
+        bar.progress(min(1.0, rows_done / max(total, 1)))
+        status.write(f"{rows_done} of {total} rows read, {imported} imported, {errors} rejected")
+
+    try:
+        imported, rejected = import_file(path, kind, progress=report, restart=restart)
+    except Exception as e:
+        st.error(f"❌ Import failed: {e}. Upload the same file again to resume.")
+        return
+
+    bar.progress(1.0)
+    st.success(f"✅ Imported {imported} {kind}.")
+    if rejected:
+        st.warning(f"⚠️ {len(rejected)} row(s) were rejected.")
+        errors = pd.DataFrame(
+            [{"Row": line, "Problems": "; ".join(problems)} for line, problems in rejected]
+        )
+        st.dataframe(errors, hide_index=True, use_container_width=True)
+        st.download_button(
+            "Download rejected rows",
+            errors.to_csv(index=False),
+            file_name=f"rejected_{kind}.csv",
+            mime="text/csv",
+        )
@@ -1,6 +1,8 @@
 import streamlit as st
-from utils.firebase_helper import get_jobs, get_applications_for_jobs, get_applicants, add_application, update_application_status
-from app_pages.view_applicants import build_dataframe, filters, sort_dataframe, search
+from utils.firebase_helper import get_jobs, get_applications_for_jobs, get_applicants, add_applications_bulk, update_application_statuses, get_job_funnel, get_candidate_matrix
+from utils.aggregates import funnel_counts
+from utils.pagination import paginate, mark_selected, sync_selection, selected_keys, select_all, clear_selection
+from app_pages.view_applicants import build_dataframe, filters, sort_dataframe, search, DATETIME_FORMAT
 from collections import Counter
 from datetime import datetime
 import plotly.express as px
@@ -83,27 +85,13 @@ def app():
     elif selected_tab == "Applications":
         st.subheader("📊 Applications Overview")
 
-        apps = get_applications_for_jobs(job_id)
-        if not apps:
+        funnel = get_job_funnel(job_id)
+        if not funnel["total"]:
             st.info("No applications found for this job.")
             return
         
-        stages = job["hiring_process"]
-
-        stage_counts = {}
-
-        for app in apps.values():
-            if "status" not in app:
-                app["status"] = "applied"
-
-            stage = app["status"]
-            index = stages.index(stage)
-            #print(index, stage, stages)
-
-            for i in range(index + 1):
-                stage_counts[stages[i]] = stage_counts.get(stages[i], 0) + 1
-        
-        counts = [stage_counts.get(stage, 0) for stage in stages]
+        stages = job.get("hiring_process", [])
+        counts = funnel_counts(funnel, stages)
 
         fig = go.Figure(go.Funnel(
             y=stages,
@@ -115,9 +103,12 @@ def app():
         ))
 
         st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"{funnel['total']} application(s), {funnel['rejected']} rejected")
 
         st.markdown("---")
 
+        apps = get_applications_for_jobs(job_id)
+
         st.subheader("📋 Application List")
         uids = {app["applicant_id"] : app["id"] for app in apps.values()}
         # Build full DataFrame with all parameters
@@ -136,24 +127,21 @@ def app():
         else:
             df = df_all.copy()
 
-        # Add a 'Select' column for user checkboxes
-        df["Select"] = False
-
-        # Display toolbar with Select All
-
-        df = search(df)
+        # Unlimited: Select All and the bulk actions work on every match
+        df = search(df, limit=None)
 
+        pager = f"job_{job_id}_applications"
         st.header(f"👥 Applicants ({len(df)})")
-        applicant_select_all = False
         if st.button("✅ Select All"):
-            df["Select"] = True
-            applicant_select_all = True    
+            select_all(df["UUID"], pager)
         st.write(f"Showing {len(df)} applicant(s) in stage: **{selected_stage}**")
-    
-        n_rows = len(df)
-        height = min((n_rows + 1) * 35 + 5, 800)
+
+        # Only the current page is sent to the browser; ticks are kept
+        # across pages by applicant ID.
+        page = mark_selected(paginate(df, pager), pager)
+        height = min((len(page) + 1) * 35 + 5, 800)
         edited_df = st.data_editor(
-            df,
+            page,
             use_container_width=True,
             height=height,
             hide_index=True,
@@ -168,31 +156,34 @@ def app():
                     help="Click to view resume",
                     display_text="View Resume"
                 ),
+                "Last Update": st.column_config.DatetimeColumn(format=DATETIME_FORMAT),
+                "Created at": st.column_config.DatetimeColumn(format=DATETIME_FORMAT),
                 "Select": st.column_config.CheckboxColumn(
                     label="✔️ Select", help="Select this applicant"
                 ),
             },
         )
-
-        if applicant_select_all:
-            edited_df["Select"] = True
+        sync_selection(edited_df, pager)
 
         if st.button("Advance Application(s)"):
-            selected = edited_df[edited_df["Select"]]
+            selected = df[df["UUID"].isin(selected_keys(pager))]
             if selected.empty:
                 st.warning("⚠️ No applicants selected.")
             else:
-                success_count = 0
-                for _, row in selected.iterrows():
-                    applicant_id = row["UUID"]
-                    try:
-                        current = row["Status"]
-                        next_idx = min(stages.index(current) + 1, len(stages) - 1)
-                        update_application_status(uids[applicant_id], stages[next_idx])
-                        success_count += 1
-                    except Exception as e:
-                        st.error(f"Error updting application for {applicant_id}: {e}")
-                st.success(f"✅ {success_count} applicant(s) advanced.")
+                transitions = {}
+                for applicant_id, current in zip(selected["UUID"], selected["Status"]):
+                    if current not in stages:
+                        st.error(f"Error updating application for {applicant_id}: unknown stage '{current}'")
+                        continue
+                    next_idx = min(stages.index(current) + 1, len(stages) - 1)
+                    transitions[uids[applicant_id]] = stages[next_idx]
+                try:
+                    update_application_statuses(transitions, current=apps)
+                except Exception as e:
+                    st.error(f"Error advancing applications: {e}")
+                    st.stop()
+                clear_selection(pager)
+                st.success(f"✅ {len(transitions)} applicant(s) advanced.")
                 st.rerun()
 
 
@@ -225,24 +216,33 @@ def app():
             app_df = filters(app_df)
             app_df = sort_dataframe(app_df)
 
-        # Add a 'Select' column for user checkboxes
-        app_df["Select"] = False
-
-        # Display toolbar with Select All
-
-        app_df = search(app_df)
-
+        app_df = search(app_df, limit=None)
+
+        # --- 🎯 Rank by job match ---
+        st.sidebar.subheader("🎯 Job Match")
+        if st.sidebar.checkbox("Rank by match score", value=False, help="Order every applicant by match, replacing the sort above"):
+            # Rank all rows so Select All and bulk actions still see everyone
+            matches = get_candidate_matrix().top_k(job, k=None, keys=app_df["UUID"])
+            matches = matches.rename(columns={
+                "score": "Match",
+                "skills": "Skill Match",
+                "experience": "Experience Match",
+                "preference": "Preference Match",
+                "ctc": "CTC Match",
+            }).mul(100).round(1)
+            app_df = matches.join(app_df.set_index("UUID"), how="inner").reset_index()
+
+        pager = f"job_{job_id}_search"
         st.header(f"👥 Applicants ({len(app_df)})")
-        app_select_all = False
         if st.button("✅ Select All"):
-            app_df["Select"] = True
-            app_select_all = True
+            select_all(app_df["UUID"], pager)
 
-        # Render in editable table
+        # Render the current page in an editable table
+        page = mark_selected(paginate(app_df, pager), pager)
         edited_df = st.data_editor(
-            app_df,
+            page,
             use_container_width=True,
-            height=min((len(app_df) + 1) * 35 + 5, 800),
+            height=min((len(page) + 1) * 35 + 5, 800),
             hide_index=True,
             column_config={
                 "Details": st.column_config.LinkColumn(
@@ -253,28 +253,30 @@ def app():
                     help="Click to view resume",
                     display_text="View Resume"
                 ),
+                "Last Update": st.column_config.DatetimeColumn(format=DATETIME_FORMAT),
+                "Created at": st.column_config.DatetimeColumn(format=DATETIME_FORMAT),
+                "Match": st.column_config.ProgressColumn(
+                    label="Match", help="Overall match with this job", format="%.0f%%", min_value=0, max_value=100
+                ),
                 "Select": st.column_config.CheckboxColumn(
                     label="✔️ Select", help="Select this applicant"
                 ),
             },
-            disabled=[col for col in app_df.columns if col not in ("Select",)],
+            disabled=[col for col in page.columns if col not in ("Select",)],
         )
+        sync_selection(edited_df, pager)
 
-        if app_select_all:
-            edited_df = app_df
-        
         if st.button("➕ Create Application(s)"):
-            selected = edited_df[edited_df["Select"]]
+            selected = app_df[app_df["UUID"].isin(selected_keys(pager))]
             if selected.empty:
                 st.warning("⚠️ No applicants selected.")
             else:
                 success_count = 0
-                for _, row in selected.iterrows():
-                    applicant_id = row["UUID"]
-                    try:
-                        add_application(job_id, applicant_id)
+                for result in add_applications_bulk(job_id, selected["UUID"].tolist()):
+                    if result["error"]:
+                        st.error(f"Error adding application for {result['applicant_id']}: {result['error']}")
+                    else:
                         success_count += 1
-                    except Exception as e:
-                        st.error(f"Error adding application for {applicant_id}: {e}")
+                clear_selection(pager)
                 st.success(f"✅ {success_count} applicant(s) applied to job.")
                 st.rerun()
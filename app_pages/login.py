@@ -1,5 +1,4 @@
 import streamlit as st
-import time
 from utils.auth import login
 
 def app():
@@ -9,7 +8,6 @@ def app():
 
     if st.button("Login"):
         with st.spinner("Logging in..."):
-            time.sleep(2)  # Simulate delay
             if username and password:
                 login(username, password)
             else:
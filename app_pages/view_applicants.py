@@ -1,63 +1,185 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime
-from utils.firebase_helper import get_applicants
+import pyarrow as pa
+import numpy as np
+import hashlib
+import threading
+from collections import OrderedDict
+from utils.firebase_helper import get_applicants, get_applicant_index, get_applicant_search_index, search_resume_contents, APPLICANT_INDEX_FIELDS
+from utils.indexes import Bitset
+from utils.pagination import paginate, stable_sort
+from utils.normalize import parse_notice_period
+from utils.resume_text import PdfReader
+from utils.filtering import FilterSpec, plan_cache, derived_version, range_mask, notice_mask, category_mask
 
-def build_dataframe(apps):
-    rows = []
+# Column name -> applicant field, for the plain text columns
+TEXT_COLUMNS = {
+    "Name": "name",
+    "Email": "email",
+    "Institute": "institute",
+    "Phone": "phone",
+    "Course": "course",
+    "Specialization": "specialization",
+    "State": "state",
+    "Country": "country",
+    "Notice Period": "notice_period",
+}
+CATEGORY_COLUMNS = {
+    "Current Mode": "current_mode",
+    "Current Duration": "current_duration",
+    "Preferred Mode": "preferred_mode",
+    "Preferred Duration": "preferred_duration",
+    "City": "city",
+    "Source": "source",
+}
+NUMERIC_COLUMNS = {
+    "Experience": "experience",
+    "Current CTC": "current_ctc",
+    "Expected CTC": "expected_ctc",
+}
+# Column name -> (epoch field, ISO field for records not yet normalized)
+DATETIME_COLUMNS = {
+    "Last Update": ("updated_ts", "updated_at"),
+    "Created at": ("created_ts", "created_at"),
+}
+COLUMN_ORDER = [
+    "UUID", "Name", "Email", "Institute", "Experience", "Current CTC", "Expected CTC",
+    "Current Mode", "Current Duration", "Preferred Mode", "Preferred Duration",
+    "City", "State", "Country", "Details", "Resume", "Skills", "Phone", "Course",
+    "Specialization", "Source", "Notice Period", "Notice Months", "Last Update", "Created at",
+]
+SEARCH_LIMIT = 200
+DATETIME_FORMAT = "MMMM DD, YYYY, hh:mm a"
+
+_frame_cache = OrderedDict()
+_frame_cache_lock = threading.Lock()
+_FRAME_CACHE_SIZE = 8
+
+
+def _content_hash(apps):
+    """
+    Hash applicant IDs with their updated_at stamps. Every write helper
+    restamps updated_at, so this changes whenever a record does.
+    """
+    digest = hashlib.blake2b(digest_size=16)
     for aid, d in apps.items():
-        rows.append({
-            "UUID": aid,
-            
-            "Name": d.get("name", ""),
-            "Email": d.get("email", ""),
-            "Institute": d.get("institute", ""),
-            "Experience": float(d.get("experience", 0)),
-            "Current CTC": float(d.get("current_ctc", 0)),
-            "Expected CTC": float(d.get("expected_ctc", 0)),
-            "Current Mode": d.get("current_mode", ""),
-            "Current Duration": d.get("current_duration", ""),
-            "Preferred Mode": d.get("preferred_mode", ""),
-            "Preferred Duration": d.get("preferred_duration", ""),
-            "City": d.get("city", ""),
-            "State": d.get("state", ""),
-            "Country": d.get("country", ""),
-            "Details": f"/applicant_detail?uid={aid}",
-            "Resume": d.get("resume_url", "Not Available"),
-            "Skills": ",".join(d.get("skills", {}).keys()),
-            "Phone": d.get("phone", ""),
-            "Course": d.get("course", ""),
-            "Specialization": d.get("specialization", ""),
-            "Source": d.get("source", ""),
-            "Notice Period": d.get("notice_period", ""),
-            "Last Update": datetime.fromisoformat(d.get("updated_at", "")).strftime("%B %d, %Y, %I:%M %p") if d.get("updated_at") else "",
-            "Created at": datetime.fromisoformat(d.get("created_at", "")).strftime("%B %d, %Y, %I:%M %p") if d.get("updated_at") else ""
-        })
-    return pd.DataFrame(rows)
-
-def parse_notice_period(val):
-    mapping = {
-        "Immediate": 0,
-        "1 Month": 1,
-        "2 Months": 2,
-        "3 Months": 3,
-    }
-    if val in mapping:
-        return mapping[val]
+        digest.update(f"{aid}\x1f{d.get('updated_at', '')}\x1e".encode())
+    return digest.hexdigest()
+
+
+def _string_column(values):
+    try:
+        array = pa.array(values, pa.string())
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        array = pa.array([None if v is None else str(v) for v in values], pa.string())
+    return pd.Series(pd.arrays.ArrowStringArray(array))
+
+
+def _category_column(values):
+    return _string_column(values).astype("category")
+
+
+def _to_local_datetime(values):
+    try:
+        # Arrow parses ISO-8601 with offsets in bulk, far faster than pandas
+        parsed = pd.Series(pa.array([v or None for v in values], pa.string()).cast(pa.timestamp("us", tz="UTC")).to_pandas())
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        parsed = pd.to_datetime(pd.Series(values, dtype="object"), errors="coerce", utc=True, format="ISO8601")
+    return parsed.dt.tz_convert("Asia/Kolkata").dt.tz_localize(None)
+
+
+def _number_column(values):
     try:
-        # Extract number if possible from string like "6 months"
-        return int(''.join(filter(str.isdigit, val)))
-    except:
-        return 99  # default high value for unknowns
+        return pd.Series(np.array([0 if v is None else v for v in values], dtype=np.float64))
+    except (TypeError, ValueError):
+        # Records written before numbers were normalized at ingest
+        return pd.to_numeric(pd.Series(values), errors="coerce").fillna(0).astype("float64")
+
+
+def _epoch_datetime(stamps, iso_values):
+    epochs = np.array([np.nan if v is None else v for v in stamps], dtype=np.float64)
+    parsed = pd.Series(pd.to_datetime(np.round(epochs * 1e6), unit="us", utc=True)).dt.tz_convert("Asia/Kolkata").dt.tz_localize(None)
+    missing = np.flatnonzero(np.isnan(epochs))
+    if len(missing):
+        # Records not yet backfilled with epoch stamps
+        values = parsed.to_numpy()
+        values[missing] = _to_local_datetime([iso_values[i] for i in missing]).to_numpy(dtype=values.dtype)
+        parsed = pd.Series(values)
+    return parsed
+
+
+def _notice_column(months, raw):
+    if any(m is None for m in months):
+        months = [parse_notice_period(r) if m is None else m for m, r in zip(months, raw)]
+    return pd.Series(np.array(months, dtype=np.int64))
+
+
+def _build_columns(apps):
+    ids = list(apps.keys())
+    records = list(apps.values())
+    data = {"UUID": _string_column(ids)}
+    for col, key in TEXT_COLUMNS.items():
+        data[col] = _string_column([d.get(key, "") for d in records])
+    data["Resume"] = _string_column([d.get("resume_url", "Not Available") for d in records])
+    for col, key in CATEGORY_COLUMNS.items():
+        data[col] = _category_column([d.get(key, "") for d in records])
+    for col, key in NUMERIC_COLUMNS.items():
+        data[col] = _number_column([d.get(key, 0) for d in records])
+    for col, (ts_key, iso_key) in DATETIME_COLUMNS.items():
+        data[col] = _epoch_datetime([d.get(ts_key) for d in records], [d.get(iso_key) for d in records])
+    data["Notice Months"] = _notice_column([d.get("notice_months") for d in records], [d.get("notice_period", "") for d in records])
+    data["Details"] = "/applicant_detail?uid=" + data["UUID"]
+    data["Skills"] = _string_column([",".join(d.get("skills", None) or {}) for d in records])
+    return pd.DataFrame(data, columns=COLUMN_ORDER)
+
+
+def build_dataframe(apps):
+    """
+    Build the applicant table column by column with typed dtypes: pyarrow
+    strings, categoricals for mode/duration/city/source, float64 for CTC and
+    experience and datetime64 for timestamps. Frames are memoized on a
+    content hash of the input and returned as copies, so callers may add
+    columns freely. The content hash is kept in df.attrs["version"] so the
+    filter and sort plans can cache their results against it.
+    """
+    key = _content_hash(apps)
+    with _frame_cache_lock:
+        df = _frame_cache.get(key)
+        if df is not None:
+            _frame_cache.move_to_end(key)
+    if df is None:
+        df = _build_columns(apps)
+        with _frame_cache_lock:
+            _frame_cache[key] = df
+            while len(_frame_cache) > _FRAME_CACHE_SIZE:
+                _frame_cache.popitem(last=False)
+    df = df.copy()
+    df.attrs["version"] = key
+    return df
 
 def filters(df, pre_filters=None):
+    """
+    Render the sidebar filters and return the matching rows. The widget
+    values are collected into a FilterSpec and compiled into one boolean
+    mask, so no intermediate frames are built; candidate sets, option
+    counts and the final row positions are cached per spec and data
+    version, so returning to an earlier selection is instant.
+    """
     pre_filters = pre_filters or {}
+    index = get_applicant_index()
+    version = df.attrs.get("version")
+    if version is not None:
+        version = (version, index.generation)
 
     st.sidebar.subheader("📊 Filters")
 
     # Numeric filters
+    ranges = []
     for num_col in ["Experience", "Current CTC", "Expected CTC"]:
-        col_min, col_max = float(df[num_col].min()), float(df[num_col].max())
+        col_min, col_max = plan_cache.get(
+            ("bounds", version, num_col),
+            lambda: (float(df[num_col].min()), float(df[num_col].max())) if len(df) else (0.0, 0.0),
+        )
         min_val = pre_filters.get(f"{num_col}_min", col_min)
         max_val = pre_filters.get(f"{num_col}_max", col_max)
 
@@ -69,22 +191,46 @@ def filters(df, pre_filters=None):
             f"{num_col} ≤", value=max_val, min_value=col_min, max_value=col_max,
             step=0.1 if num_col == "Experience" else 1000.0
         )
-        df = df[(df[num_col] >= min_input) & (df[num_col] <= max_input)]
-
-    # Categorical filters
-    for col in [
-        "Course", "Institute", "Country", "State", "City",
-        "Current Mode", "Preferred Mode", "Current Duration", "Preferred Duration", "Source"
-    ]:
-        options = sorted(df[col].dropna().unique())
+        if min_input > col_min or max_input < col_max:
+            ranges.append((num_col, min_input, max_input))
+    ranges = tuple(ranges)
+
+    # Categorical filters, answered from the bitmap index when it covers
+    # every row and by scanning the frame otherwise
+    ordinals = plan_cache.get(("ordinals", version), lambda: index.ordinals_for(df["UUID"]))
+    use_index = not (ordinals < 0).any()
+
+    def candidates_for(categories):
+        def build():
+            if categories:
+                column, values = categories[-1]
+                return candidates_for(categories[:-1]) & index.match(column, values)
+            return Bitset.from_members(ordinals[range_mask(df, ranges)])
+        return plan_cache.get(("candidates", version, ranges, categories), build)
+
+    def counts_for(col, categories):
+        def build():
+            if use_index:
+                return index.option_counts(col, within=candidates_for(categories))
+            mask = range_mask(df, ranges) & category_mask(df, categories)
+            return {k: v for k, v in df[col][mask].astype(str).value_counts().items() if v}
+        return plan_cache.get(("counts", version, ranges, categories, col), build)
+
+    categories = ()
+    for col in APPLICANT_INDEX_FIELDS:
+        counts = counts_for(col, categories)
+        options = sorted(counts)
         # Fallback if pre_filter contains invalid entries
         default_selected = pre_filters.get(col, ["All"])
         valid_default = [val for val in default_selected if val in options]
         default_final = default_selected if valid_default else ["All"]
 
-        selected = st.sidebar.multiselect(f"{col}", ["All"] + options, default=default_final)
+        selected = st.sidebar.multiselect(
+            f"{col}", ["All"] + options, default=default_final,
+            format_func=lambda v, counts=counts: v if v == "All" else f"{v} ({counts.get(v, 0)})"
+        )
         if "All" not in selected:
-            df = df[df[col].isin(selected)]
+            categories += ((col, tuple(sorted(selected))),)
 
     # Notice Period Filter
     notice_options = ["Immediate", "1 Month", "2 Months", "3 Months", "More than 3 Months"]
@@ -92,45 +238,83 @@ def filters(df, pre_filters=None):
     valid_notice = [val for val in default_notice if val in notice_options]
     selected_notice = st.sidebar.multiselect("Notice Period", ["All"] + notice_options, default=valid_notice or ["All"])
 
+    notice = None
     if "All" not in selected_notice:
         if "More than 3 Months" in selected_notice:
-            df = df[df["Notice Period"].apply(lambda x: parse_notice_period(x) > 3)]
+            notice = "more"
         else:
-            selected_nums = [parse_notice_period(opt) for opt in selected_notice]
-            df = df[df["Notice Period"].apply(lambda x: parse_notice_period(x) in selected_nums)]
+            notice = tuple(sorted(parse_notice_period(opt) for opt in selected_notice))
 
-    return df
+    spec = FilterSpec(ranges, categories, notice)
+
+    def positions():
+        if use_index:
+            mask = candidates_for(categories).to_mask(index.size())[ordinals]
+        else:
+            mask = range_mask(df, ranges) & category_mask(df, categories)
+        if notice is not None:
+            mask &= notice_mask(df, notice)
+        return np.flatnonzero(mask)
+
+    rows = plan_cache.get(("rows", version, spec), positions)
+    # A shallow copy when nothing is filtered out, so tagging the result
+    # with its derived version leaves the caller's frame untouched
+    result = df.iloc[rows] if len(rows) < len(df) else df.copy(deep=False)
+    result.attrs["version"] = derived_version(version, spec)
+    return result
 
-def search(df):
+def search(df, limit=SEARCH_LIMIT, pre_search=None):
     st.subheader("🔎 Search")
+    search_options = ["UUID", "Name, Email or Phone", "Resume Contents"]
+    default_by = pre_search.get("by", "UUID") if pre_search else "UUID"
+    default_keyword = pre_search.get("keyword", "") if pre_search else ""
 
     # Create two columns with ratio 30:70
     col1, col2 = st.columns([3, 7])
 
     with col1:
-        search_by = st.selectbox("Search By", ["UUID", "Name or Email"])
+        search_by = st.selectbox("Search By", search_options, index=search_options.index(default_by))
 
     with col2:
         if search_by == "UUID":
-            keyword = st.text_input("Applicant UUID", placeholder="Enter UUID to filter")
-            if keyword:
-                df = df[df["UUID"].str.contains(keyword, case=False)]
+            keyword = st.text_input("Applicant UUID", value=default_keyword, placeholder="Enter UUID to filter")
+            fields, fuzzy = ["UUID"], False
+        elif search_by == "Resume Contents":
+            keyword = st.text_input("Resume Keywords", value=default_keyword, placeholder="Enter words to find in resumes")
+            if PdfReader is None:
+                st.warning("Resume text cannot be extracted because pypdf is not installed, so this search finds nothing. Run `pip install pypdf`.")
         else:
-            keyword = st.text_input("Keyword", placeholder="Enter name or email to search")
-            if keyword:
-                df = df[df["Name"].str.contains(keyword, case=False) | df["Email"].str.contains(keyword, case=False)]
+            keyword = st.text_input("Keyword", value=default_keyword, placeholder="Enter name, email or phone to search")
+            fields, fuzzy = ["Name", "Email", "Phone"], True
 
+    if not keyword:
+        return df
+
+    if search_by == "Resume Contents":
+        # BM25-ranked hits from the resume full-text index
+        hits = search_resume_contents(keyword, limit=None)
+    else:
+        # Ranked hits from the trigram index; close misspellings are
+        # included after the exact and substring matches.
+        hits = get_applicant_search_index().search(keyword, fields=fields, limit=None, fuzzy=fuzzy)
+    rank = {uid: i for i, (uid, _) in enumerate(hits)}
+    order = df["UUID"].map(rank)
+    df = df[order.notna()]
+    if not df.attrs.get("sorted"):
+        # Best matches first, unless the user picked a sort order
+        df = df.iloc[order[order.notna()].to_numpy().argsort(kind="stable")]
+    if limit and len(df) > limit:
+        st.caption(f"Showing the first {limit} of {len(df)} matches.")
+        df = df.head(limit)
+    df.attrs["version"] = derived_version(df.attrs.get("version"), search_by, keyword)
     return df
 
 def sort_dataframe(df, pre_sort=None):
-    # Add numeric column for notice period sorting
-    df["notice_period_num"] = df["Notice Period"].apply(parse_notice_period)
-
     sort_options = {
         "None": None,
         "Experience": "Experience",
-        "CTC": "CTC",
-        "Notice Period": "notice_period_num"
+        "CTC": "Expected CTC",
+        "Notice Period": "Notice Months"
     }
 
     default_sort = pre_sort.get("column", "None") if pre_sort else "None"
@@ -142,7 +326,15 @@ def sort_dataframe(df, pre_sort=None):
     if sort_choice != "None":
         ascending = st.sidebar.radio("Order", ["Ascending", "Descending"], horizontal=True) == default_order
         sort_col = sort_options[sort_choice]
-        df = df.sort_values(by=sort_col, ascending=ascending)
+        version = df.attrs.get("version")
+        # Sort only the key columns and cache the resulting row order
+        order = plan_cache.get(
+            ("sort", version, sort_col, ascending),
+            lambda: stable_sort(df[[sort_col, "UUID"]].reset_index(drop=True), sort_col, ascending).index.to_numpy(),
+        )
+        df = df.iloc[order]
+        df.attrs["version"] = derived_version(version, sort_col, ascending)
+        df.attrs["sorted"] = True
 
     return df
 
@@ -174,14 +366,14 @@ def app():
 
     df = search(df)  # Apply search after filters and sorting
     
-    # Calculate dynamic height: ~35px per row + header
     n_rows = len(df)
-    height = min((n_rows + 1) * 35 + 5, 800)  # Cap at e.g. 800px to avoid massive pages
-
     st.header(f"👥 Applicants ({n_rows})")
-    df.drop(columns=["notice_period_num"], inplace=True, errors='ignore')  # Clean up temp column if exists
+
+    # Only the current page is sent to the browser
+    page = paginate(df, "applicants")
+    height = min((len(page) + 1) * 35 + 5, 800)  # Cap at e.g. 800px to avoid massive pages
     st.dataframe(
-        df,
+        page,
         use_container_width=True,
         height=height,
         hide_index=True,
@@ -196,5 +388,7 @@ def app():
                 help="Click to view resume",
                 display_text="View Resume"
             ),
+            "Last Update": st.column_config.DatetimeColumn(format=DATETIME_FORMAT),
+            "Created at": st.column_config.DatetimeColumn(format=DATETIME_FORMAT),
         },
     )
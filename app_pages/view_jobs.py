@@ -1,13 +1,14 @@
 import streamlit as st
 import pandas as pd
-from utils.firebase_helper import get_jobs, get_applications_for_jobs
+from utils.firebase_helper import get_jobs, get_application_counts
+from utils.pagination import paginate
 from datetime import datetime, timedelta
 
 def build_dataframe(jobs):
     rows = []
+    application_counts = get_application_counts()
     for job_id, job in jobs.items():
-        applications = get_applications_for_jobs(job_id)
-        applicant_count = len(applications) if applications else 0
+        applicant_count = application_counts.get(job_id, 0)
 
         posted_at = job.get("posted_at", "")
         posted_on = posted_at.split("T")[0] if posted_at else "-"
@@ -107,11 +108,13 @@ def app():
     
     # -------------------- DISPLAY --------------------
     n_rows = len(df)
-    height = min((n_rows + 1) * 35 + 5, 800)  # Cap at e.g. 800px to avoid massive pages
-
     st.header(f"📄 Job Listings ({n_rows})")
+
+    # Only the current page is sent to the browser
+    page = paginate(df, "jobs", key="ID")
+    height = min((len(page) + 1) * 35 + 5, 800)  # Cap at e.g. 800px to avoid massive pages
     st.dataframe(
-        df,
+        page,
         use_container_width=True,
         height=height,
         hide_index=True,
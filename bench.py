@@ -0,0 +1,289 @@
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from itertools import count
+
+# Data-path benchmarks over synthetic datasets from lol.py.
+#
+# Each size runs in its own process against a scratch copy of a seeded
+# SQLite dataset, so write benchmarks never change the dataset and sizes
+# do not share caches. Datasets are generated once into bench_data/ and
+# reused while the size and seed match. Results are printed (or written
+# with --out) as JSON: one entry per (size, operation) with min, median
+# and max seconds over the repeats.
+#
+#   python bench.py --sizes 1000 10000 --repeat 5 --out bench.json
+
+SIZES = [1000, 10000, 100000, 1000000]
+DATA_DIR = os.environ.get("bench_data_dir", "bench_data")
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def jobs_for(size):
+    return max(10, size // 100)
+
+
+def dataset_path(size, seed):
+    return os.path.join(DATA_DIR, f"synthetic_{size}_seed{seed}.db")
+
+
+def ensure_dataset(size, seed):
+    """
+    Generate the dataset for size and seed unless it already exists.
+    Returns the seconds spent generating it (None if it was reused).
+    """
+    path = dataset_path(size, seed)
+    if os.path.exists(path):
+        return None
+    os.makedirs(DATA_DIR, exist_ok=True)
+    tmp_path = f"{path}.part"
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(tmp_path + suffix):
+            os.remove(tmp_path + suffix)
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory() as scratch:
+        env = {**os.environ, "resume_index_file": os.path.join(scratch, "resume_index.db")}
+        subprocess.run(
+            [sys.executable, os.path.join(HERE, "lol.py"), "--applicants", str(size),
+             "--jobs", str(jobs_for(size)), "--seed", str(seed), "--db", tmp_path],
+            check=True, env=env, cwd=HERE, stdout=subprocess.DEVNULL,
+        )
+    # Fold the WAL back into the main file so the dataset is a single file
+    import sqlite3
+    conn = sqlite3.connect(tmp_path)
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.execute("PRAGMA journal_mode=DELETE")
+    conn.close()
+    os.replace(tmp_path, path)
+    return time.perf_counter() - started
+
+
+def timed(fn, repeat, setup=None):
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return {"runs": repeat, "min": min(times), "median": statistics.median(times), "max": max(times)}
+
+
+def resume_file(n):
+    """
+    A small, valid one-page PDF upload whose content differs for each n.
+    """
+    text = f"BT /F1 12 Tf 72 720 Td (Benchmark resume {n} Python SQL) Tj ET".encode()
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(text), text),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    pdf, offsets = bytearray(b"%PDF-1.4\n"), []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (i, body)
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    upload = io.BytesIO(bytes(pdf))
+    upload.name = f"resume_{n}.pdf"
+    return upload
+
+
+def run_size(size, repeat):
+    """
+    Time every data path against the configured backend. Must run in a
+    fresh process whose environment already points at the scratch dataset.
+    """
+    from utils import firebase_helper as fh
+    from utils.cache import invalidate, clear as clear_cache
+    from utils.filtering import plan_cache
+    from streamlit import config
+    from streamlit.logger import set_log_level
+    from app_pages.view_applicants import build_dataframe, filters, sort_dataframe, search
+
+    # Widgets run in bare mode here, which logs a warning on every call
+    config.set_option("logger.level", "error")
+    set_log_level("error")
+
+    results = {}
+
+    def bench(name, fn, setup=None, runs=repeat):
+        results[name] = timed(fn, runs, setup)
+
+    fh.init_firebase()
+
+    # First loads: each builds state that later calls reuse
+    bench("get_applicants.first", fh.get_applicants, runs=1)
+    bench("get_applicant_index.first", fh.get_applicant_index, runs=1)
+    # The trigram index loads lazily, on its first search
+    bench("get_applicant_search_index.first", lambda: fh.get_applicant_search_index().search("000"), runs=1)
+    bench("get_candidate_matrix.first", fh.get_candidate_matrix, runs=1)
+    apps = fh.get_applicants()
+    bench("build_dataframe.first", lambda: build_dataframe(apps), runs=1)
+
+    uids = sorted(apps)
+    jobs = fh.get_jobs()
+    job_ids = sorted(jobs)
+    sample_uids = uids[:: max(1, len(uids) // 10)][:10]
+    job_id = max(job_ids, key=lambda j: jobs[j].get("status") == "open")
+
+    # Reads
+    bench("get_applicants", fh.get_applicants)
+    bench("get_applicants.keyed_10", lambda: fh.get_applicants(sample_uids), setup=lambda: invalidate("applicants"))
+    bench("get_jobs", fh.get_jobs, setup=lambda: invalidate("jobs"))
+    bench("get_jobs.keyed_1", lambda: fh.get_jobs([job_id]), setup=lambda: invalidate("jobs"))
+    bench("get_open_jobs", fh.get_open_jobs, setup=lambda: invalidate("jobs"))
+    bench("get_applications_for_applicant", lambda: fh.get_applications_for_applicant(uids[0]))
+    bench("get_applications_for_jobs", lambda: fh.get_applications_for_jobs(job_id))
+    bench("get_application_counts", fh.get_application_counts, setup=lambda: invalidate("applications"))
+    bench("get_skills", fh.get_skills, setup=lambda: invalidate("skills"))
+    bench("get_education", fh.get_education, setup=lambda: invalidate("education"))
+    bench("get_clients", fh.get_clients, setup=lambda: invalidate("clients"))
+    bench("get_job_funnel", lambda: fh.get_job_funnel(job_id))
+    bench("get_aggregates", fh.get_aggregates, setup=lambda: invalidate("aggregates"))
+    bench("get_vacancies", lambda: fh.get_vacancies(breakdown=True), setup=lambda: invalidate("aggregates"))
+    bench("get_candidate_matrix.top_k", lambda: fh.get_candidate_matrix().top_k(jobs[job_id], k=50))
+
+    # Applicant table
+    bench("build_dataframe", lambda: build_dataframe(apps))
+    df = build_dataframe(apps)
+    city_filter = {"City": ["Bangalore"], "Experience_min": 2.0, "Notice Period": ["1 Month"]}
+    bench("filters.none", lambda: filters(df), setup=plan_cache.clear)
+    bench("filters.none.cached", lambda: filters(df))
+    bench("filters.city_experience_notice", lambda: filters(df, city_filter), setup=plan_cache.clear)
+    bench("filters.city_experience_notice.cached", lambda: filters(df, city_filter))
+    experience_sort = {"column": "Experience", "order": "Descending"}
+    bench("sort_dataframe.experience", lambda: sort_dataframe(df, experience_sort), setup=plan_cache.clear)
+    bench("sort_dataframe.experience.cached", lambda: sort_dataframe(df, experience_sort))
+    name = apps[uids[len(uids) // 2]]["name"].split()[0]
+    bench("search.uuid", lambda: search(df, pre_search={"by": "UUID", "keyword": uids[-1]}))
+    bench("search.name", lambda: search(df, pre_search={"by": "Name, Email or Phone", "keyword": name}))
+    bench("search.name_fuzzy", lambda: search(df, pre_search={"by": "Name, Email or Phone", "keyword": name[:-1] + "x"}))
+    bench("search.resume", lambda: search(df, pre_search={"by": "Resume Contents", "keyword": "python"}))
+
+    # Writes, against the scratch copy
+    template = {k: v for k, v in apps[uids[0]].items() if k not in ("id", "resume_hash")}
+
+    bench("add_applicant", lambda: fh.add_applicant(dict(template), None, new_skills=list(template.get("skills") or [])))
+    bench("update_applicant", lambda: fh.update_applicant(uids[0], {"city": template.get("city")}))
+    uploads = count()
+    bench("update_applicant.resume", lambda: fh.update_applicant(uids[0], {}, resume=resume_file(next(uploads))))
+    names = count()
+    bench("add_skills", lambda: fh.add_skills([f"Bench Skill {next(names)}"]))
+    bench("add_clients", lambda: fh.add_clients([f"Bench Client {next(names)}"]))
+    bench("add_education", lambda: fh.add_education("Bench Course", f"Bench Specialization {next(names)}"))
+    job_template = {k: v for k, v in jobs[job_id].items() if k not in ("id", "posted_at")}
+    bench("add_job", lambda: fh.add_job(dict(job_template), new_skills=job_template.get("skills"), client=job_template.get("client")))
+
+    def existing_apps():
+        return sorted(fh.get_applications_for_jobs(job_id))
+
+    bench("add_application", lambda: fh.add_application(job_id, uids[-1]))
+    app_ids = existing_apps()
+    bench("update_application_status", lambda: fh.update_application_status(app_ids[0], "Screening"))
+    bench("update_application_statuses.50", lambda: fh.update_application_statuses({a: "Screening" for a in app_ids[:50]}))
+    bench("reject_application", lambda: fh.reject_application(app_ids[0], "true"))
+    bulk_ids = iter([uids[i:i + 50] for i in range(0, 50 * repeat, 50)])
+    bench("add_applications_bulk.50", lambda: fh.add_applications_bulk(job_id, next(bulk_ids)))
+    doomed = iter(existing_apps()[-repeat:])
+    bench("delete_application", lambda: fh.delete_application(next(doomed)))
+    victims = iter(uids[1:repeat + 1])
+    bench("delete_applicants.1", lambda: fh.delete_applicants([next(victims)]))
+    victim_groups = iter([uids[i:i + 100] for i in range(repeat + 1, repeat + 1 + 100 * repeat, 100)])
+    bench("delete_applicants.100", lambda: fh.delete_applicants(next(victim_groups)))
+
+    clear_cache()
+    return results
+
+
+def run_child(size, seed, repeat):
+    """
+    Run run_size for one dataset in a subprocess and return its results.
+    """
+    with tempfile.TemporaryDirectory() as scratch:
+        db = os.path.join(scratch, "bench.db")
+        shutil.copyfile(dataset_path(size, seed), db)
+        env = {
+            **os.environ,
+            "storage_backend": "sqlite",
+            "sqlite_file": db,
+            "resume_index_file": os.path.join(scratch, "resume_index.db"),
+            "resumes_dir": os.path.join(scratch, "resumes"),
+        }
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", "--sizes", str(size), "--repeat", str(repeat)],
+            check=True, env=env, cwd=HERE, stdout=subprocess.PIPE, text=True,
+        ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=HERE, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the applicant data paths on synthetic data")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="numbers of applicants")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, HERE)
+        print(json.dumps(run_size(args.sizes[0], args.repeat)))
+        sys.exit(0)
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": [],
+        "failures": [],
+    }
+    for size in args.sizes:
+        print(f"{size} applicants: preparing dataset", file=sys.stderr)
+        generated = ensure_dataset(size, args.seed)
+        if generated is not None:
+            report["results"].append({"size": size, "op": "generate_dataset", "runs": 1,
+                                      "min": generated, "median": generated, "max": generated})
+        print(f"{size} applicants: running benchmarks", file=sys.stderr)
+        try:
+            results = run_child(size, args.seed, args.repeat)
+        except subprocess.CalledProcessError as e:
+            # Typically the largest sizes running out of memory; keep the rest
+            print(f"{size} applicants: benchmark process failed ({e})", file=sys.stderr)
+            report["failures"].append({"size": size, "returncode": e.returncode})
+            continue
+        for op, stats in results.items():
+            report["results"].append({"size": size, "op": op, **stats})
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
@@ -1,5 +1,14 @@
+import argparse
 import random
-from utils.firebase_helper import add_job, init_firebase, add_applicant
+from itertools import accumulate
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from utils.firebase_helper import vocabulary_updates, education_updates
+from utils.storage import get_backend, set_backend, SQLiteBackend
+from utils.cache import clear as clear_cache
+from utils.ids import id_allocator
+from utils.aggregates import rebuild_aggregates, rebuild_funnels
+from utils.normalize import normalized_fields
 
 def get_dummy_jobs(n):
     """
@@ -96,13 +105,282 @@ def create_dummy_applicant():
     }, list(new_skills))
 
 
-# Example usage:
+# Synthetic data at scale
+#
+# generate_dataset() builds N applicants, M jobs and their applications
+# (with status histories) from one seeded random.Random, so a given seed
+# and profile always produce the same records, IDs and timestamps. Records
+# are written in multi-path batches, then the aggregate and funnel nodes
+# are rebuilt from what was written.
+#
+#   python lol.py --applicants 100000 --jobs 1000 --seed 7 --db synthetic.db
+
+# Weighted choices are {value: weight}; ranges are (low, high).
+DEFAULT_PROFILE = {
+    "names": ["Aarav", "Priya", "Rohan", "Ananya", "Vikram", "Sneha", "Arjun", "Kavya", "Rahul", "Meera",
+              "Alice", "Bob", "Charlie", "Diana", "Ethan", "Fiona"],
+    "surnames": ["Sharma", "Patel", "Iyer", "Reddy", "Singh", "Gupta", "Nair", "Das", "Khan", "Mehta"],
+    "courses": {
+        "B.Tech": ["Computer Science", "Mechanical", "Electronics", "AI"],
+        "M.Tech": ["Computer Science", "AI", "Data Science"],
+        "B.Sc": ["Physics", "Mathematics", "Computer Science"],
+        "MBA": ["Finance", "Marketing", "HR"],
+        "BCA": ["Computer Applications"],
+    },
+    "institutes": ["IIT Delhi", "NIT Trichy", "IIM Bangalore", "BITS Pilani", "Anna University",
+                   "VIT Vellore", "Delhi University", "IIIT Hyderabad"],
+    "locations": {
+        ("Bangalore", "Karnataka"): 30, ("Hyderabad", "Telangana"): 15, ("Mumbai", "Maharashtra"): 15,
+        ("Pune", "Maharashtra"): 10, ("Delhi", "Delhi"): 12, ("Chennai", "Tamil Nadu"): 10,
+        ("Kolkata", "West Bengal"): 5, ("Jaipur", "Rajasthan"): 3,
+    },
+    "skills": ["Python", "SQL", "JavaScript", "React", "Node.js", "Docker", "Kubernetes", "AWS", "Azure",
+               "Java", "Go", "Machine Learning", "Data Analysis", "Cybersecurity", "Project Management",
+               "Communication", "Leadership", "Excel", "Power BI", "Spark"],
+    "skills_per_applicant": (2, 7),
+    "skills_per_job": (2, 5),
+    "modes": {"Onsite": 45, "Hybrid": 35, "Remote": 20},
+    "durations": {"Full Time": 80, "Contractual": 20},
+    "job_durations": {"Full Time": 70, "Contractual (6+6)": 10, "Contractual (1 year )": 10, "Internship": 10},
+    "sources": {"Job Site": 55, "Referral": 30, "Social Media": 15},
+    "notice_periods": {"Immediate": 20, "1 Month": 30, "2 Months": 25, "3 Months": 20, "5 Months": 5},
+    # Experience is log-normal in years; CTC grows with experience
+    "experience_lognormal": (1.2, 0.7),
+    "base_ctc": 350000,
+    "ctc_per_year": 120000,
+    "expected_hike": (1.1, 1.5),
+    "clients": ["Acme Corp", "Globex Inc", "Soylent LLC", "Initech", "Umbrella Corp", "Hooli",
+                "Stark Industries", "Wayne Enterprises", "Dunder Mifflin", "Pied Piper"],
+    "departments": {"Engineering": 50, "Data": 15, "Product": 10, "Sales": 10, "Finance": 8, "HR": 7},
+    "job_titles": ["Software Engineer", "Data Analyst", "Backend Developer", "Frontend Developer",
+                   "DevOps Engineer", "Product Manager", "Business Analyst", "QA Engineer"],
+    "hiring_process": ["applied", "Screening", "Technical Interview", "Offer", "hired"],
+    "vacancies": (1, 5),
+    "open_job_share": 0.8,
+    # Applications per applicant are drawn from a geometric distribution
+    "applications_per_applicant": 1.5,
+    # Chance of moving on from each stage, and of being rejected at it
+    "advance_probability": 0.45,
+    "reject_probability": 0.25,
+    "history_days": 365,
+    "start_date": "2025-01-01T09:00:00+05:30",
+}
+
+
+def _weighted(rng, options):
+    values, cum_weights = options
+    return rng.choices(values, cum_weights=cum_weights)[0]
+
+
+def _prepare(profile):
+    # Turn every {value: weight} option into (values, cumulative weights) once
+    prepared = dict(profile)
+    for key, value in profile.items():
+        if isinstance(value, dict) and all(isinstance(w, (int, float)) for w in value.values()):
+            weights = list(accumulate(value.values()))
+            prepared[key] = (list(value), weights)
+    return prepared
+
+
+def _stamp(moment):
+    return moment.isoformat()
+
+
+def _synthetic_applicant(rng, profile, created):
+    name = f"{rng.choice(profile['names'])} {rng.choice(profile['surnames'])}"
+    course = rng.choice(list(profile["courses"]))
+    city, state = _weighted(rng, profile["locations"])
+    experience = round(min(rng.lognormvariate(*profile["experience_lognormal"]) - 1, 30), 1)
+    experience = max(experience, 0.0)
+    current_ctc = round(profile["base_ctc"] + experience * profile["ctc_per_year"] * rng.uniform(0.7, 1.3), -3)
+    skills = rng.sample(profile["skills"], k=rng.randint(*profile["skills_per_applicant"]))
+    updated = created + timedelta(minutes=rng.randint(0, 60 * 24 * 30))
+    record = {
+        "name": name,
+        "phone": f"+91 {rng.randint(6000000000, 9999999999)}",
+        "email": f"{name.lower().replace(' ', '.')}{rng.randint(1, 99999)}@example.com",
+        "course": course,
+        "specialization": rng.choice(profile["courses"][course]),
+        "institute": rng.choice(profile["institutes"]),
+        "skills": {skill: round(rng.uniform(0.5, max(experience, 0.5)), 1) for skill in skills},
+        "city": city,
+        "state": state,
+        "country": "India",
+        "current_mode": _weighted(rng, profile["modes"]),
+        "current_duration": _weighted(rng, profile["durations"]),
+        "preferred_mode": _weighted(rng, profile["modes"]),
+        "preferred_duration": _weighted(rng, profile["durations"]),
+        "source": _weighted(rng, profile["sources"]),
+        "experience": experience,
+        "notice_period": _weighted(rng, profile["notice_periods"]),
+        "current_ctc": current_ctc,
+        "expected_ctc": round(current_ctc * rng.uniform(*profile["expected_hike"]), -3),
+        "resume_url": "https://www.princexml.com/samples/icelandic/dictionary.pdf",
+        "created_at": _stamp(created),
+        "updated_at": _stamp(updated),
+    }
+    record.update(normalized_fields(record))
+    return record
+
+
+def _synthetic_job(rng, profile, posted):
+    low = rng.randint(3, 20)
+    return {
+        "job_title": rng.choice(profile["job_titles"]),
+        "department": _weighted(rng, profile["departments"]),
+        "location": ", ".join(_weighted(rng, profile["locations"])),
+        "work_mode": _weighted(rng, profile["modes"]),
+        "experience_required": float(rng.randint(0, 10)),
+        "budget": f"{low}-{low + rng.randint(2, 10)} LPA",
+        "vacancies": rng.randint(*profile["vacancies"]),
+        "skills": rng.sample(profile["skills"], k=rng.randint(*profile["skills_per_job"])),
+        "hiring_process": list(profile["hiring_process"]),
+        "job_duration": _weighted(rng, profile["job_durations"]),
+        "description": "Design, develop, and maintain scalable services.",
+        "responsibilities": "Write clean code, review PRs and ensure system reliability.",
+        "benefits": "Health insurance, flexible hours, annual bonus.",
+        "qualifications": "Graduate in a related field",
+        "client": rng.choice(profile["clients"]),
+        "contact_person": "HR Team",
+        "contact": "hr@example.com",
+        "posted_by": "recruiter@example.com",
+        "status": "open" if rng.random() < profile["open_job_share"] else "closed",
+        "posted_at": _stamp(posted),
+    }
+
+
+def _synthetic_application(rng, profile, job_id, job, applicant_id, applied):
+    """
+    One application with an activity history: the applicant moves through
+    the job's hiring stages until they stop advancing or are rejected.
+    """
+    stages = job["hiring_process"]
+    activity = {stages[0]: _stamp(applied)}
+    moment, reached, rejected = applied, 0, False
+    while reached + 1 < len(stages):
+        if rng.random() < profile["reject_probability"]:
+            rejected = True
+            break
+        if rng.random() >= profile["advance_probability"]:
+            break
+        reached += 1
+        moment += timedelta(hours=rng.randint(4, 24 * 14))
+        activity[stages[reached]] = _stamp(moment)
+    return {
+        "job_id": job_id,
+        "applicant_id": applicant_id,
+        "applied_at": _stamp(applied),
+        "status": stages[reached],
+        "rejected": "true" if rejected else "false",
+        "activity": activity,
+    }
+
+
+def _applications_for(rng, profile):
+    # Geometric count with the configured mean (0 is allowed)
+    p = 1 / (1 + profile["applications_per_applicant"])
+    count = 0
+    while rng.random() >= p:
+        count += 1
+    return count
+
+
+def generate_dataset(n_applicants, n_jobs, seed=0, profile=None, batch_size=5000, progress=None):
+    """
+    Write a synthetic dataset to the current backend and return
+    {"applicants": n, "jobs": n, "applications": n}.
+
+    progress(kind, done, total) is called after every written batch.
+    """
+    profile = _prepare({**DEFAULT_PROFILE, **(profile or {})})
+    rng = random.Random(seed)
+    backend = get_backend()
+    start = datetime.fromisoformat(profile["start_date"]).astimezone(ZoneInfo("Asia/Kolkata"))
+    span = timedelta(days=profile["history_days"])
+
+    def offset():
+        return start + timedelta(seconds=rng.randint(0, int(span.total_seconds())))
+
+    updates = {}
+
+    def flush(kind, done, total, force=False):
+        if updates and (force or len(updates) >= batch_size):
+            backend.update("/", updates)
+            updates.clear()
+            if progress:
+                progress(kind, done, total)
+
+    # Jobs first so applications can reference them
+    job_ids = id_allocator.allocate("jobs", n_jobs) if n_jobs else []
+    jobs = {}
+    for i, job_id in enumerate(job_ids, start=1):
+        job = _synthetic_job(rng, profile, offset())
+        job["id"] = job_id
+        jobs[job_id] = job
+        updates[f"jobs/{job_id}"] = job
+        flush("jobs", i, n_jobs)
+    flush("jobs", n_jobs, n_jobs, force=True)
+
+    skills, clients, education = set(), {j["client"] for j in jobs.values()}, set()
+    for job in jobs.values():
+        skills.update(job["skills"])
+
+    # Application IDs are reserved a batch at a time
+    reserved = []
+
+    def next_application_id():
+        if not reserved:
+            reserved.extend(reversed(id_allocator.allocate("applications", batch_size)))
+        return reserved.pop()
+
+    applications = 0
+    applicant_ids = id_allocator.allocate("applicants", n_applicants) if n_applicants else []
+    for i, applicant_id in enumerate(applicant_ids, start=1):
+        applicant = _synthetic_applicant(rng, profile, offset())
+        applicant["id"] = applicant_id
+        updates[f"applicants/{applicant_id}"] = applicant
+        skills.update(applicant["skills"])
+        education.add((applicant["course"], applicant["specialization"]))
+
+        count = min(_applications_for(rng, profile), len(job_ids))
+        if count:
+            app_ids = [next_application_id() for _ in range(count)]
+            created = datetime.fromisoformat(applicant["created_at"])
+            for app_id, job_id in zip(app_ids, rng.sample(job_ids, count)):
+                applied = created + timedelta(hours=rng.randint(0, 24 * 30))
+                record = _synthetic_application(rng, profile, job_id, jobs[job_id], applicant_id, applied)
+                record["id"] = app_id
+                updates[f"applications/{app_id}"] = record
+            applications += count
+        flush("applicants", i, n_applicants)
+    flush("applicants", n_applicants, n_applicants, force=True)
+
+    vocab = {**vocabulary_updates("skills", skills), **vocabulary_updates("clients", clients)}
+    for course, specialization in education:
+        vocab.update(education_updates(course, specialization))
+    if vocab:
+        backend.update("/", vocab)
+    rebuild_aggregates()
+    rebuild_funnels()
+    clear_cache()
+    return {"applicants": n_applicants, "jobs": n_jobs, "applications": applications}
+
+
 if __name__ == "__main__":
-    init_firebase()
-    '''for job in get_dummy_jobs(16):
-        print(job, "\n")
-        add_job(job, new_skills=job["skills"], client=job["client"])'''
-    
-    for applicant in [create_dummy_applicant() for _ in range(10)]:
-        print(applicant[0], "\n")
-        add_applicant(applicant[0], None, new_skills=list(applicant[1]))
+    parser = argparse.ArgumentParser(description="Write a seeded synthetic dataset to a local SQLite database")
+    parser.add_argument("--applicants", type=int, default=1000)
+    parser.add_argument("--jobs", type=int, default=None, help="defaults to one job per 100 applicants")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--db", default="synthetic.db", help="SQLite file to write (never the live database)")
+    parser.add_argument("--batch", type=int, default=5000)
+    args = parser.parse_args()
+
+    set_backend(SQLiteBackend(args.db))
+    jobs = args.jobs if args.jobs is not None else max(10, args.applicants // 100)
+
+    def report(kind, done, total):
+        print(f"\r{kind}: {done}/{total}", end="", flush=True)
+
+    counts = generate_dataset(args.applicants, jobs, seed=args.seed, batch_size=args.batch, progress=report)
+    print(f"\nWrote {counts['applicants']} applicants, {counts['jobs']} jobs and "
+          f"{counts['applications']} applications to {args.db}")
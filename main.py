@@ -1,5 +1,5 @@
 import streamlit as st
-from app_pages import view_applicants, add_job, add_application, dashboard, applicant_details, login, logout, add_user, view_jobs, job_details, add_applicant
+from app_pages import view_applicants, add_job, add_application, dashboard, applicant_details, login, logout, add_user, import_data, view_jobs, job_details, add_applicant
 
 # Setup
 st.set_page_config(page_title="Applicant Manager", layout="wide")
@@ -60,6 +60,7 @@ else:
 
 if st.session_state.get("username") == "admin":
     pages["Account"].append(st.Page(add_user.app, title="Add User", icon="🛠️", url_path="add_user"))
+    pages["Account"].append(st.Page(import_data.app, title="Import Data", icon="📥", url_path="import_data"))
 
 
 current_page = st.navigation(pages, position="sidebar")
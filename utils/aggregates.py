@@ -0,0 +1,241 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from utils.storage import get_backend, encode_key, decode_key, increment
+
+# Materialized dashboard numbers, kept up to date by the write helpers in
+# firebase_helper:
+#
+#   aggregates/applicants                     number of applicants
+#   aggregates/clients                        number of clients
+#   aggregates/open_jobs                      number of open jobs
+#   aggregates/vacancies                      vacancies over open jobs
+#   aggregates/vacancies_by_department/<key>  vacancies per department
+#   aggregates/vacancies_by_mode/<key>        vacancies per work mode
+#   aggregates/rebuilt_at                     set once the node has been computed
+#
+# Per-job hiring funnels, kept up to date by the application helpers:
+#
+#   funnels/<job_id>/total           number of applications
+#   funnels/<job_id>/stages/<key>    applications currently at each stage
+#   funnels/<job_id>/rejected        rejected applications
+#   funnels/<job_id>/built           set once the funnel has been computed
+#
+# Run `python -m utils.aggregates` to recompute everything from scratch.
+
+AGGREGATES_PATH = "aggregates"
+BREAKDOWNS = ("vacancies_by_department", "vacancies_by_mode")
+FUNNELS_PATH = "funnels"
+
+
+def job_vacancies(job):
+    # Treat missing or non-int as 0
+    try:
+        return int(job.get("vacancies", 0) or 0)
+    except (ValueError, TypeError):
+        return 0
+
+
+def job_deltas(job, sign=1):
+    """
+    Return the aggregate deltas contributed by one job (sign=-1 removes it).
+    """
+    if job.get("status", "open") != "open":
+        return {}
+    vac = job_vacancies(job) * sign
+    dept = encode_key(job.get("department") or "Unknown")
+    mode = encode_key(job.get("work_mode") or "Unknown")
+    return {
+        "open_jobs": sign,
+        "vacancies": vac,
+        f"vacancies_by_department/{dept}": vac,
+        f"vacancies_by_mode/{mode}": vac,
+    }
+
+
+def apply_deltas(deltas):
+    """
+    Add deltas ({relative path: amount}) to the aggregates node in one
+    transaction. Until the node has been built only a change marker is
+    written, so a first build running meanwhile retries and counts this
+    write; the first read builds it from scratch.
+    """
+    deltas = {path: amount for path, amount in deltas.items() if amount}
+    if not deltas:
+        return
+
+    def bump(current):
+        if not _built(current):
+            current = current if isinstance(current, dict) else {}
+            return {"writes": current.get("writes", 0) + 1}
+        current = dict(current)
+        for path, amount in deltas.items():
+            if "/" in path:
+                group, key = path.split("/", 1)
+                bucket = dict(current.get(group) or {})
+                bucket[key] = bucket.get(key, 0) + amount
+                if bucket[key] <= 0:
+                    bucket.pop(key)
+                current[group] = bucket
+            else:
+                current[path] = max(current.get(path, 0) + amount, 0)
+        return current
+
+    get_backend().transaction(AGGREGATES_PATH, bump)
+
+
+def compute_aggregates():
+    """
+    Recompute every aggregate from the source nodes.
+    """
+    backend = get_backend()
+    applicants = backend.get("applicants", shallow=True) or {}
+    clients = backend.get("clients") or []
+    client_names = clients.values() if isinstance(clients, dict) else clients
+    open_jobs = backend.query("jobs", "status", equal_to="open")
+
+    aggregates = {
+        "applicants": len(applicants),
+        "clients": len({c for c in client_names if isinstance(c, str) and c}),
+        "open_jobs": 0,
+        "vacancies": 0,
+        "vacancies_by_department": {},
+        "vacancies_by_mode": {},
+    }
+    for job in open_jobs.values():
+        for path, amount in job_deltas(job).items():
+            if "/" in path:
+                group, key = path.split("/", 1)
+                aggregates[group][key] = aggregates[group].get(key, 0) + amount
+            else:
+                aggregates[path] += amount
+    aggregates["rebuilt_at"] = datetime.now(ZoneInfo("Asia/Kolkata")).isoformat()
+    return aggregates
+
+
+def _built(aggregates):
+    return isinstance(aggregates, dict) and "rebuilt_at" in aggregates
+
+
+def rebuild_aggregates():
+    # Counted inside the transaction so a delta landing meanwhile either
+    # retries the rebuild or waits for it
+    return get_backend().transaction(AGGREGATES_PATH, lambda current: compute_aggregates())
+
+
+def read_aggregates():
+    """
+    Return the aggregates with department/mode keys decoded, building the
+    node on first use.
+    """
+    backend = get_backend()
+    aggregates = backend.get(AGGREGATES_PATH)
+    if not _built(aggregates):
+        def build(current):
+            if _built(current):
+                # Another reader built it first
+                return current
+            return compute_aggregates()
+
+        aggregates = backend.transaction(AGGREGATES_PATH, build)
+    result = dict(aggregates)
+    for group in BREAKDOWNS:
+        result[group] = {decode_key(k): v for k, v in (aggregates.get(group) or {}).items() if v}
+    return result
+
+
+def funnel_deltas(app, sign=1):
+    """
+    Return the funnel counter deltas contributed by one application record
+    (sign=-1 removes it), keyed by absolute path.
+    """
+    job_id = app.get("job_id") if app else None
+    if not job_id:
+        return {}
+    base = f"{FUNNELS_PATH}/{job_id}"
+    deltas = {
+        f"{base}/total": sign,
+        f"{base}/stages/{encode_key(app.get('status') or 'applied')}": sign,
+    }
+    if app.get("rejected") == "true":
+        deltas[f"{base}/rejected"] = sign
+    return deltas
+
+
+def merge_deltas(*deltas):
+    merged = {}
+    for delta in deltas:
+        for path, amount in delta.items():
+            merged[path] = merged.get(path, 0) + amount
+    return merged
+
+
+def increment_updates(deltas):
+    """
+    Turn {path: amount} deltas into multi-path update entries.
+    """
+    return {path: increment(amount) for path, amount in deltas.items() if amount}
+
+
+def compute_funnel(apps):
+    funnel = {"total": 0, "rejected": 0, "stages": {}, "built": True}
+    for app in apps.values():
+        key = encode_key(app.get("status") or "applied")
+        funnel["stages"][key] = funnel["stages"].get(key, 0) + 1
+        funnel["total"] += 1
+        if app.get("rejected") == "true":
+            funnel["rejected"] += 1
+    return funnel
+
+
+def read_funnel(job_id):
+    """
+    Return {"total", "rejected", "stages": {status: count}} for a job,
+    computing and storing it first if the job predates funnel counters.
+    """
+    backend = get_backend()
+    funnel = backend.get(f"{FUNNELS_PATH}/{job_id}")
+    if not isinstance(funnel, dict) or not funnel.get("built"):
+        def build(current):
+            if isinstance(current, dict) and current.get("built"):
+                return current
+            # Counted inside the transaction so an increment landing
+            # meanwhile either retries the build or waits for it
+            return compute_funnel(backend.query("applications", "job_id", equal_to=job_id))
+
+        funnel = backend.transaction(f"{FUNNELS_PATH}/{job_id}", build)
+    return {
+        "total": funnel.get("total", 0),
+        "rejected": funnel.get("rejected", 0),
+        "stages": {decode_key(k): v for k, v in (funnel.get("stages") or {}).items() if v},
+    }
+
+
+def funnel_counts(funnel, stages):
+    """
+    Number of applications that reached each stage, in order. Applications
+    whose status is not one of the stages only count towards the first.
+    """
+    counts = [funnel["stages"].get(stage, 0) for stage in stages]
+    for i in range(len(counts) - 2, -1, -1):
+        counts[i] += counts[i + 1]
+    if counts:
+        counts[0] = max(counts[0], funnel["total"])
+    return counts
+
+
+def rebuild_funnels():
+    apps = get_backend().get("applications") or {}
+    by_job = {}
+    for app_id, app in apps.items():
+        if app.get("job_id"):
+            by_job.setdefault(app["job_id"], {})[app_id] = app
+    funnels = {job_id: compute_funnel(job_apps) for job_id, job_apps in by_job.items()}
+    get_backend().set(FUNNELS_PATH, funnels)
+    return funnels
+
+
+if __name__ == "__main__":
+    from utils.firebase_helper import init_firebase
+    init_firebase()
+    print(rebuild_aggregates())
+    print(f"Rebuilt funnels for {len(rebuild_funnels())} job(s)")
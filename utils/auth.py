@@ -1,8 +1,9 @@
 import streamlit as st
 from dotenv import load_dotenv
-import bcrypt, os, json
+import bcrypt, os
 from datetime import datetime
 from streamlit_cookies_manager import EncryptedCookieManager
+from utils import user_store
 
 load_dotenv()
 
@@ -17,31 +18,23 @@ if not cookies.ready():
 
 # Function to hash a password using bcrypt
 def hash_password(password):
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+    return user_store.hash_password(password)
 
 def check_password(stored_hash, password):
     return bcrypt.checkpw(password.encode('utf-8'), stored_hash)
 
-# Function to load users from a JSON file
+# Function to load users from the JSON file (cached until it changes)
 def load_users():
-    try:
-        with open(os.environ.get("user_file"), "r") as f:
-            users = json.load(f)
-        return users
-    except FileNotFoundError:
-        return {}
+    return user_store.user_store.load()
 
-# Function to save a new user to the JSON file
+# Function to save a new user; returns False if the username is taken
 def save_user(username, password_hash):
-    users = load_users()
-    users[username] = password_hash.decode("utf-8")
-    with open(os.environ.get("user_file"), "w") as f:
-        json.dump(users, f)
+    return user_store.user_store.add(username, password_hash.decode("utf-8"))
 
 # Function to manage login
 def login(username, password):
-    users = load_users()
-    if username in users and check_password(bytes(users[username], "utf-8"), password):
+    ok, retry_after = user_store.authenticate(username, password)
+    if ok:
         st.session_state.username = username
         cookies["username"] = username  # Store username in cookie
         cookies.save()  # Save cookie
@@ -49,6 +42,8 @@ def login(username, password):
         st.session_state.logged_in = True
         st.session_state.last_activity_time = datetime.now()
         st.rerun()
+    elif retry_after:
+        st.error(f"Too many failed attempts. Try again in {int(retry_after) + 1} seconds.")
     else:
         st.error("Invalid username or password!")
 
@@ -88,7 +83,9 @@ if __name__ == "__main__":
     confirm_password = input("Confirm password: ")
     if password == confirm_password:
         hashed_password = hash_password(password)
-        save_user(username, hashed_password)
-        print(f"User {username} has been created successfully!")
+        if save_user(username, hashed_password):
+            print(f"User {username} has been created successfully!")
+        else:
+            print(f"User {username} already exists.")
     else:
         print("Passwords do not match.")
\ No newline at end of file
@@ -0,0 +1,76 @@
+import os
+import threading
+from functools import wraps
+from cachetools import TTLCache
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# One cache per process, shared by every Streamlit session. Entries expire
+# after read_cache_ttl seconds so writes made by other processes show up
+# eventually; writes made through firebase_helper invalidate immediately.
+_cache = TTLCache(
+    maxsize=int(os.environ.get("read_cache_size", 64)),
+    ttl=float(os.environ.get("read_cache_ttl", 300)),
+)
+_cache_lock = threading.Lock()
+_fill_locks = {}
+_generations = {}
+
+
+def cached_read(node):
+    """
+    Cache the result of a zero-argument read function under the given
+    database node. Concurrent misses for the same key wait for a single
+    fetch instead of each going to the database.
+
+    Cached values are shared between sessions and must be treated as
+    read-only by callers.
+    """
+    def decorator(fn):
+        key = (node, fn.__name__)
+
+        @wraps(fn)
+        def wrapper():
+            with _cache_lock:
+                if key in _cache:
+                    return _cache[key]
+                fill_lock = _fill_locks.setdefault(key, threading.Lock())
+            with fill_lock:
+                with _cache_lock:
+                    if key in _cache:
+                        return _cache[key]
+                    generation = _generations.get(node, 0)
+                value = fn()
+                with _cache_lock:
+                    # Skip storing if a write invalidated the node mid-fetch
+                    if _generations.get(node, 0) == generation:
+                        _cache[key] = value
+                return value
+
+        def peek():
+            """
+            Return the cached value, or None without fetching on a miss.
+            """
+            with _cache_lock:
+                return _cache.get(key)
+
+        wrapper.peek = peek
+        return wrapper
+    return decorator
+
+
+def invalidate(*nodes):
+    """
+    Drop every cached read that depends on one of the given nodes.
+    """
+    with _cache_lock:
+        for node in nodes:
+            _generations[node] = _generations.get(node, 0) + 1
+        for key in [k for k in _cache.keys() if k[0] in nodes]:
+            _cache.pop(key, None)
+
+
+def clear():
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,82 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict, namedtuple
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# A complete description of the applicant table filters:
+#   ranges      ((column, low, high), ...) inclusive numeric bounds
+#   categories  ((column, (value, ...)), ...) allowed values per column
+#   notice      sorted notice months to keep, or "more" for > 3 months
+# Columns left at "All" or their full range are omitted, so equivalent
+# selections compare and hash equal.
+FilterSpec = namedtuple("FilterSpec", ["ranges", "categories", "notice"])
+
+
+class PlanCache:
+    """
+    Small thread-safe LRU for filter plan results (candidate sets, option
+    counts, row positions) keyed by data version plus spec. Keys whose data
+    version is None are never cached.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        if key[1] is None:
+            return build()
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        value = build()
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+plan_cache = PlanCache(int(os.environ.get("filter_cache_size", 128)))
+
+
+def derived_version(version, *parts):
+    """
+    Version string for a frame derived from one at version by the given
+    plan, so later stages can cache on it too.
+    """
+    if version is None:
+        return None
+    return hashlib.blake2b(repr((version, parts)).encode(), digest_size=16).hexdigest()
+
+
+def range_mask(df, ranges):
+    mask = np.ones(len(df), dtype=bool)
+    for column, low, high in ranges:
+        values = df[column].to_numpy()
+        mask &= (values >= low) & (values <= high)
+    return mask
+
+
+def notice_mask(df, notice):
+    months = df["Notice Months"].to_numpy()
+    if notice == "more":
+        return months > 3
+    return np.isin(months, notice)
+
+
+def category_mask(df, categories):
+    mask = np.ones(len(df), dtype=bool)
+    for column, values in categories:
+        mask &= df[column].isin(values).to_numpy()
+    return mask
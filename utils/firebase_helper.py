@@ -1,81 +1,117 @@
 import firebase_admin
-from firebase_admin import credentials, db
+from firebase_admin import credentials
 from datetime import datetime
 from zoneinfo import ZoneInfo
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 import mimetypes
 import os
-from nanoid import generate
 from dotenv import load_dotenv
+from utils.storage import get_backend, FirebaseBackend, encode_key, decode_key
+from utils.cache import cached_read, invalidate
+from utils.sync import applicants_mirror, delta_sync_enabled
+from utils.ids import id_allocator
+from utils.indexes import BitmapIndex, TrigramIndex
+from utils.matching import CandidateMatrix
+from utils.normalize import normalized_fields
+from utils.resumes import store_resume, release_resume, release_legacy_resume
+from utils.resume_text import resume_index
+from utils.aggregates import (
+    apply_deltas, job_deltas, read_aggregates,
+    funnel_deltas, merge_deltas, increment_updates, read_funnel
+)
 
 load_dotenv()
 
 
 def init_firebase():
-    if not firebase_admin._apps:
+    """
+    Initialise the configured storage backend. The Firebase app is only
+    set up when the Realtime Database backend is in use.
+    """
+    backend = get_backend()
+    if isinstance(backend, FirebaseBackend) and not firebase_admin._apps:
         cred = credentials.Certificate(os.environ.get("cred_file"))
         firebase_admin.initialize_app(cred, {
             "databaseURL" : "https://test-1f76f-default-rtdb.asia-southeast1.firebasedatabase.app/",
             #"storageBucket": "test-1f76f.appspot.com"
         })
-    return db.reference("/")
+    return backend
+
+def generate_unique_numeric_id(path):
+    """
+    Return a new numeric ID for the node at path from the block allocator.
+    """
+    return id_allocator.allocate(path)[0]
+
 
-def generate_unique_numeric_id(path, length=6):
-    alphabet = '0123456789'
-    max_attempts = 10000  # Prevent infinite loops
+# Vocabulary helpers
+#
+# Skills, clients and education are stored keyed by their (escaped) value,
+# so merging new entries only writes the new keys and concurrent writers
+# cannot drop each other's entries. Older databases may still hold these
+# nodes as plain lists; readers accept both shapes.
 
-    for _ in range(max_attempts):
-        uid = generate(alphabet, length)
-        ref = db.reference(f'{path}/{uid}')
-        if ref.get() is None:  # UID does not exist
-            return uid
+def _vocab_values(node):
+    values = node.values() if isinstance(node, dict) else (node or [])
+    return list(dict.fromkeys(v for v in values if isinstance(v, str) and v))
 
-    raise Exception("Unable to generate a unique ID after many attempts.")
+def vocabulary_updates(node, values):
+    """
+    Return the multi-path update that merges values into a keyed vocabulary.
+    """
+    return {f"{node}/{encode_key(v)}": v for v in values if v}
+
+def education_updates(course, specialization):
+    course = course.strip()
+    specialization = specialization.strip()
+    if not course or not specialization:
+        return {}
+    return {f"education/{encode_key(course)}/{encode_key(specialization)}": specialization}
 
 
 # Add Functions
 
 def add_skills(new_skills):
     """
-    Merge and add new skills to the list stored in /skills.
+    Merge new skills into /skills, writing only the new keys.
     """
-    ref = db.reference("skills")
-    existing = ref.get()
-    existing_skills = existing if isinstance(existing, list) else []
-    
-    updated_skills = list(set(existing_skills + new_skills))
-    ref.set(updated_skills)
+    updates = vocabulary_updates("skills", new_skills)
+    if updates:
+        get_backend().update("/", updates)
+        invalidate("skills")
 
 def add_clients(new_clients):
     """
-    Merge and add new clients to the list stored in /clients.
+    Merge new clients into /clients, writing only the new keys.
     """
-    ref = db.reference("clients")
-    existing = ref.get()
-    existing_clients = existing if isinstance(existing, list) else []
-    
-    updated_clients = list(set(existing_clients + new_clients))
-    ref.set(updated_clients)
+    backend = get_backend()
+    added = 0
+    for client in dict.fromkeys(c for c in new_clients if c):
+        # Claim each key in a transaction so only the writer that creates
+        # it counts it, however stale this process's client list is
+        created = []
+
+        def claim(current, client=client, created=created):
+            created[:] = [current is None]
+            return client if current is None else current
+
+        backend.transaction(f"clients/{encode_key(client)}", claim)
+        added += created[0]
+    if new_clients:
+        invalidate("clients")
+    if added:
+        apply_deltas({"clients": added})
+        invalidate("aggregates")
 
 def add_education(course, specialization):
-
-    course = course.strip()
-    specialization = specialization.strip()
-
-    if not course or not specialization:
-        return
-
-    ref = db.reference("education")
-
-    current_data = ref.get() or {}
-
-    if course in current_data:
-        existing_specs = current_data[course]
-        if specialization not in existing_specs:
-            existing_specs.append(specialization)
-            ref.child(course).set(existing_specs)
-    else:
-        ref.child(course).set([specialization])
+    """
+    Record a course/specialization pair under /education.
+    """
+    updates = education_updates(course, specialization)
+    if updates:
+        get_backend().update("/", updates)
+        invalidate("education")
     
 
 def add_applicant(data, resume, new_skills=None):
@@ -87,17 +123,26 @@ def add_applicant(data, resume, new_skills=None):
     data["id"] = applicant_id
     data["created_at"] = datetime.now(ZoneInfo("Asia/Kolkata")).isoformat()
     data["updated_at"] = datetime.now(ZoneInfo("Asia/Kolkata")).isoformat()
-
+    data.update(normalized_fields(data))
 
     if resume:
-        resume_url = upload_resume_to_firebase(applicant_id, resume)
-        data["resume_url"] = resume_url
+        data["resume_hash"], data["resume_url"] = upload_resume_to_firebase(applicant_id, resume)
     else:
         data["resume_url"] = 'https://www.princexml.com/samples/icelandic/dictionary.pdf'
 
     # Save applicant data
-    applicants_ref = db.reference("applicants")
-    applicants_ref.child(applicant_id).set(data)
+    try:
+        get_backend().set(f"applicants/{applicant_id}", data)
+    except Exception:
+        # Give back the reference store_resume took for this record
+        release_resume(data.get("resume_hash"))
+        raise
+    invalidate("applicants")
+    _index_applicants({applicant_id: data})
+    apply_deltas({"applicants": 1})
+    invalidate("aggregates")
+    if resume:
+        resume_index.schedule(applicant_id, data["resume_url"], data["resume_hash"])
 
     # Update skills list
     if new_skills:
@@ -105,7 +150,8 @@ def add_applicant(data, resume, new_skills=None):
 
 def upload_resume_to_firebase(applicant_id, file):
     """
-    Uploads the resume PDF to Firebase Storage under a folder named 'resumes/{applicant_id}.pdf'
+    Store the resume PDF in the content-addressed resume store and return
+    (resume_hash, resume_url). The caller owns one reference to it.
     """
     '''bucket = storage.bucket()
     blob = bucket.blob(f"resumes/{applicant_id}.pdf")
@@ -113,15 +159,7 @@ def upload_resume_to_firebase(applicant_id, file):
     blob.make_public()  # optional, or use token-based access
     return blob.public_url'''
 
-    resumes_dir = "resumes"
-    os.makedirs(resumes_dir, exist_ok=True)
-
-    file_path = os.path.join(resumes_dir, f"{applicant_id}.pdf")
-
-    with open(file_path, "wb") as f:
-        f.write(file.getbuffer())
-
-    return file_path
+    return store_resume(file)
 
 def add_job(data, new_skills=None, client=None):
     """
@@ -131,168 +169,462 @@ def add_job(data, new_skills=None, client=None):
     data["id"] = job_id
     data["posted_at"] = datetime.now(ZoneInfo("Asia/Kolkata")).isoformat()
 
-    jobs_ref = db.reference("jobs")
-    jobs_ref.child(job_id).set(data)
+    get_backend().set(f"jobs/{job_id}", data)
+    invalidate("jobs")
+    apply_deltas(job_deltas(data))
+    invalidate("aggregates")
 
     if new_skills:
         add_skills(new_skills)
     if client:
         add_clients([client])
 
-def add_application(job_id, applicant_id):
-    applications_ref = db.reference("applications")
-    new_id = str(generate_unique_numeric_id("applications"))
-    applications_ref.child(new_id).set({
-        "id": new_id,
+def _application_record(app_id, job_id, applicant_id, applied_at):
+    return {
+        "id": app_id,
         "job_id": job_id,
         "applicant_id": applicant_id,
-        "applied_at": datetime.now(ZoneInfo("Asia/Kolkata")).isoformat(),
+        "applied_at": applied_at,
         "status": "applied",
         "rejected": "false",
+    }
+
+def add_application(job_id, applicant_id):
+    new_id = str(generate_unique_numeric_id("applications"))
+    applied_at = datetime.now(ZoneInfo("Asia/Kolkata")).isoformat()
+    record = _application_record(new_id, job_id, applicant_id, applied_at)
+    get_backend().update("/", {
+        f"applications/{new_id}": record,
+        **increment_updates(funnel_deltas(record)),
     })
+    invalidate("applications")
+
+def add_applications_bulk(job_id, applicant_ids):
+    """
+    Create applications to one job for many applicants at once. IDs are
+    allocated in one step and every record is written in a single
+    multi-location update.
+
+    Returns one dict per requested applicant with keys applicant_id, id
+    (the new application ID, or None) and error (None on success).
+    """
+    existing = {app.get("applicant_id") for app in get_applications_for_jobs(job_id).values()}
+    results, pending, seen = [], [], set()
+    for applicant_id in applicant_ids:
+        if not applicant_id:
+            error = "Missing applicant ID"
+        elif applicant_id in existing:
+            error = "Already applied to this job"
+        elif applicant_id in seen:
+            error = "Duplicate in selection"
+        else:
+            error = None
+            seen.add(applicant_id)
+        result = {"applicant_id": applicant_id, "id": None, "error": error}
+        results.append(result)
+        if error is None:
+            pending.append(result)
+
+    if not pending:
+        return results
+
+    new_ids = id_allocator.allocate("applications", len(pending))
+    applied_at = datetime.now(ZoneInfo("Asia/Kolkata")).isoformat()
+    updates, deltas = {}, []
+    for result, new_id in zip(pending, new_ids):
+        record = _application_record(new_id, job_id, result["applicant_id"], applied_at)
+        updates[f"applications/{new_id}"] = record
+        deltas.append(funnel_deltas(record))
+        result["id"] = new_id
+    updates.update(increment_updates(merge_deltas(*deltas)))
+    try:
+        get_backend().update("/", updates)
+    except Exception as e:
+        for result in pending:
+            result["id"], result["error"] = None, str(e)
+    invalidate("applications")
+    return results
 
 
 # Get Functions
 
+@cached_read("jobs")
 def get_open_jobs():
-    ref = db.reference("jobs")
-    jobs = ref.order_by_child("status").equal_to("open").get()
+    jobs = get_backend().query("jobs", "status", equal_to="open")
     return jobs or {}  # returns a dict of {job_id: job_data}
 
+# Categorical applicant filters served from bitmap indexes, keyed by the
+# applicant table column name.
+APPLICANT_INDEX_FIELDS = {
+    "Course": "course",
+    "Institute": "institute",
+    "Country": "country",
+    "State": "state",
+    "City": "city",
+    "Current Mode": "current_mode",
+    "Preferred Mode": "preferred_mode",
+    "Current Duration": "current_duration",
+    "Preferred Duration": "preferred_duration",
+    "Source": "source",
+}
+applicant_index = BitmapIndex(APPLICANT_INDEX_FIELDS)
+applicants_mirror.subscribe(applicant_index.apply)
+
+# Free-text applicant search; None means the applicant key itself.
+APPLICANT_SEARCH_FIELDS = {
+    "UUID": None,
+    "Name": "name",
+    "Email": "email",
+    "Phone": "phone",
+}
+applicant_search_index = TrigramIndex(APPLICANT_SEARCH_FIELDS)
+applicants_mirror.subscribe(applicant_search_index.apply)
+_index_sources = {}
+_index_changes = None
+_candidate_matrix = None
+
+# Up to this many IDs are fetched as parallel per-record lookups; larger
+# sets read the whole node once.
+KEYED_FETCH_THRESHOLD = int(os.environ.get("keyed_fetch_threshold", 50))
+
+# Bounded pool for keyed child lookups, shared by every session
+_fetch_pool = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("keyed_fetch_workers", 8)),
+    thread_name_prefix="keyed-fetch",
+)
+
+def _fetch_children(path, keys):
+    """
+    Fetch path/<key> for each key in parallel and return {key: record}
+    for the ones that exist.
+    """
+    keys = [key for key in keys if key]
+    backend = get_backend()
+    records = _fetch_pool.map(lambda key: backend.get(f"{path}/{key}"), keys)
+    return {key: record for key, record in zip(keys, records) if record is not None}
+
+def _lookup(path, keys, read_all):
+    """
+    Return {key: record} for keys under path. Served from the cached node
+    when it is warm, by parallel keyed lookups for small sets and by one
+    full read otherwise.
+    """
+    keys = list(dict.fromkeys(keys))
+    records = read_all.peek()
+    if records is None and len(keys) <= KEYED_FETCH_THRESHOLD:
+        return _fetch_children(path, keys)
+    if records is None:
+        records = read_all()
+    return {key: records[key] for key in keys if key in records}
+
+@cached_read("applicants")
+def _all_applicants():
+    if delta_sync_enabled():
+        return applicants_mirror.sync()
+    return get_backend().get("applicants") or {}
+
+@cached_read("jobs")
+def _all_jobs():
+    return get_backend().get("jobs") or {}
+
 def get_applicants(uids=None):
-    ref = db.reference("applicants")
-    all_apps = ref.get() or {}
     if uids:
-        return {uid: data for uid, data in all_apps.items() if uid in uids}
-    return all_apps
+        return _lookup("applicants", uids, _all_applicants)
+    return _all_applicants()
+
+def get_applicant_index():
+    """
+    Return the bitmap index over the current applicants. With delta sync it
+    is maintained incrementally by the mirror; otherwise it is built once
+    and then updated with the records that changed whenever a fresh
+    applicants node is fetched.
+    """
+    return _current_index(applicant_index)
+
+def get_applicant_search_index():
+    """
+    Return the trigram search index over name, email, phone and UUID,
+    kept current the same way as get_applicant_index.
+    """
+    return _current_index(applicant_search_index)
+
+def search_resume_contents(query, limit=50):
+    """
+    Return [(applicant_id, score)] for applicants whose resume text matches
+    every word of query, best first.
+    """
+    return resume_index.search(query, limit)
+
+def get_candidate_matrix():
+    """
+    Return a CandidateMatrix over the current applicants for job match
+    scoring, rebuilt only when the applicants change.
+    """
+    global _candidate_matrix
+    records = _all_applicants()
+    if _candidate_matrix is None or _candidate_matrix[0] is not records:
+        _candidate_matrix = (records, CandidateMatrix(records))
+    return _candidate_matrix[1]
+
+def _index_applicants(updated, removed=()):
+    """
+    Fold applicants written by this process into the indexes right away,
+    whichever sync mode is in use.
+    """
+    applicant_index.apply(updated, removed)
+    applicant_search_index.apply(updated, removed)
+
+def _changes(old, new):
+    """
+    Return (updated, removed) between two applicants snapshots, computed
+    once per pair however many indexes ask.
+    """
+    global _index_changes
+    if _index_changes is None or _index_changes[0] is not old or _index_changes[1] is not new:
+        updated = {key: record for key, record in new.items() if old.get(key) != record}
+        removed = [key for key in old if key not in new]
+        _index_changes = (old, new, (updated, removed))
+    return _index_changes[2]
+
+def _current_index(index):
+    records = _all_applicants()
+    source = _index_sources.get(id(index))
+    if not delta_sync_enabled() and source is not records:
+        if source is None:
+            index.rebuild(records)
+        else:
+            # A fresh read after a write or cache expiry: only fold in the
+            # records that differ from the snapshot the index last saw
+            index.apply(*_changes(source, records))
+        _index_sources[id(index)] = records
+    return index
 
 def get_jobs(jobids=None):
-    ref = db.reference("jobs")
-    all_jobs = ref.get() or {}
     if jobids:
-        return {jobid: data for jobid, data in all_jobs.items() if jobid in jobids}
-    return all_jobs
+        return _lookup("jobs", jobids, _all_jobs)
+    return _all_jobs()
 
 def get_applications_for_applicant(uid):
-    ref = db.reference("applications")
-    apps = ref.order_by_child("applicant_id").equal_to(uid).get()
+    apps = get_backend().query("applications", "applicant_id", equal_to=uid)
     return apps or {}
 
 def get_applications_for_jobs(uid):
-    ref = db.reference("applications")
-    apps = ref.order_by_child("job_id").equal_to(uid).get()
+    apps = get_backend().query("applications", "job_id", equal_to=uid)
     return apps or {}
 
+@cached_read("applications")
+def get_application_counts():
+    """
+    Return {job_id: number of applications} for every job in one pass.
+    """
+    return get_backend().count_by("applications", "job_id")
+
+@cached_read("skills")
 def get_skills():
     """
     Fetch the list of skills from the Realtime Database.
     """
-    ref = db.reference("skills")
-    skills = ref.get()
-    return skills if isinstance(skills, list) else []
+    return _vocab_values(get_backend().get("skills"))
 
+@cached_read("education")
 def get_education():
     """
     Fetch the education courses and specializations from the Realtime Database.
     """
-    ref = db.reference("education")
-    education = ref.get()
-    return education if isinstance(education, dict) else {}
-
+    education = get_backend().get("education")
+    if not isinstance(education, dict):
+        return {}
+    merged = {}
+    for course, specs in education.items():
+        merged.setdefault(decode_key(course), []).extend(_vocab_values(specs))
+    return {course: list(dict.fromkeys(specs)) for course, specs in merged.items()}
+
+@cached_read("clients")
 def get_clients():
     """
-    Fetch the list of skills from the Realtime Database.
+    Fetch the list of clients from the Realtime Database.
+    """
+    return _vocab_values(get_backend().get("clients"))
+
+def get_job_funnel(job_id):
     """
-    ref = db.reference("clients")
-    clients = ref.get()
-    return clients if isinstance(clients, list) else []
+    Return the maintained hiring funnel summary for a job:
+    {"total": n, "rejected": n, "stages": {status: applications at that stage}}.
+    """
+    return read_funnel(job_id)
+
+@cached_read("aggregates")
+def get_aggregates():
+    """
+    Return the materialized dashboard aggregates (counts and vacancy
+    breakdowns) instead of downloading the underlying nodes.
+    """
+    return read_aggregates()
 
 def get_vacancies(breakdown=False):
     """
-    Compute total vacancies and breakdown by department for open jobs.
+    Return total vacancies and breakdown by department for open jobs.
     
     Returns:
         total_vacancies (int): sum of vacancies for all open jobs.
         vacancies_by_dept (dict): mapping from department name to total vacancies.
     """
-    open_jobs = get_open_jobs()  # uses your existing helper to fetch open jobs dict
-    total = 0
-    vacancies_by_dept = {}
-    vacancies_by_mode = {}
-    for job_id, data in open_jobs.items():
-        # Treat missing or non-int as 0
-        vac = data.get("vacancies", 0) or 0
-        try:
-            vac = int(vac)
-        except (ValueError, TypeError):
-            vac = 0
-        total += vac
-        dept = data.get("department") or "Unknown"
-        vacancies_by_dept[dept] = vacancies_by_dept.get(dept, 0) + vac
-        mode = data.get("work_mode") or "Unknown"
-        vacancies_by_mode[mode] = vacancies_by_mode.get(mode, 0) + vac
-
+    aggregates = get_aggregates()
+    total = aggregates.get("vacancies", 0)
     if breakdown:
-        return total, vacancies_by_dept, vacancies_by_mode
+        return total, aggregates["vacancies_by_department"], aggregates["vacancies_by_mode"]
     return total
 
 
 # Update Functions
 
-def update_application_status(app_id: str, new_status: str) -> None:
+def _current_applications(app_ids, current=None):
+    """
+    Return {app_id: record} for the given IDs, reading only the records the
+    caller did not already supply.
+    """
+    current = current or {}
+    return {
+        app_id: current.get(app_id) or get_backend().get(f"applications/{app_id}") or {}
+        for app_id in app_ids
+    }
+
+def update_application_status(app_id: str, new_status: str, current: dict = None) -> None:
     """
     Update the 'status' field of an application document in Firestore.
+    Pass the application record as current to skip re-reading it.
     """
-    print(f"Updating application {app_id} to status '{new_status}'")
-    app_ref = db.reference(f"applications/{app_id}/status")
-    app_ref.set(new_status)
-    app_ref = db.reference(f"applications/{app_id}/activity")
-    app_ref.child(new_status).set(datetime.now(ZoneInfo("Asia/Kolkata")).isoformat())
+    update_application_statuses({app_id: new_status}, {app_id: current} if current else None)
 
-def reject_application(app_id: str, value: str) -> None:
+def update_application_statuses(transitions: dict, current: dict = None) -> None:
+    """
+    Apply {app_id: new_status} transitions, together with their activity
+    timestamps and funnel counters, in one atomic multi-path update.
+    current may map app IDs to their records to avoid re-reading them.
+    """
+    if not transitions:
+        return
+    records = _current_applications(transitions, current)
+    now = datetime.now(ZoneInfo("Asia/Kolkata")).isoformat()
+    updates, deltas = {}, []
+    for app_id, new_status in transitions.items():
+        updates[f"applications/{app_id}/status"] = new_status
+        updates[f"applications/{app_id}/activity/{new_status}"] = now
+        old = records[app_id]
+        deltas += [funnel_deltas(old, -1), funnel_deltas({**old, "status": new_status})]
+    updates.update(increment_updates(merge_deltas(*deltas)))
+    get_backend().update("/", updates)
+    invalidate("applications")
+
+def reject_application(app_id: str, value: str, current: dict = None) -> None:
     """
     Mark an application as rejected by setting 'rejected' to True.
     """
-    app_ref = db.reference(f"applications/{app_id}/rejected")
-    app_ref.set(value)
+    old = _current_applications([app_id], {app_id: current} if current else None)[app_id]
+    deltas = merge_deltas(funnel_deltas(old, -1), funnel_deltas({**old, "rejected": value}))
+    get_backend().update("/", {
+        f"applications/{app_id}/rejected": value,
+        **increment_updates(deltas),
+    })
+    invalidate("applications")
 
 def update_applicant(uid: str, data: dict, resume=None, new_skills: list = None) -> None:
     """
     Update an applicant's data in Firestore.
     """
     data["updated_at"] = datetime.now(ZoneInfo("Asia/Kolkata")).isoformat()
+    data.update(normalized_fields(data))
 
+    old_resume = old_url = None
     if resume:
-        resume_url = upload_resume_to_firebase(uid, resume)
-        data["resume_url"] = resume_url
+        old_resume = get_backend().get(f"applicants/{uid}/resume_hash")
+        if not old_resume:
+            old_url = get_backend().get(f"applicants/{uid}/resume_url")
+        data["resume_hash"], data["resume_url"] = upload_resume_to_firebase(uid, resume)
 
     if new_skills:
         add_skills(new_skills)
 
-    db.reference(f"applicants/{uid}").update(data)
+    try:
+        get_backend().update(f"applicants/{uid}", data)
+    except Exception:
+        if resume:
+            release_resume(data["resume_hash"])
+        raise
+    invalidate("applicants")
+    record = get_backend().get(f"applicants/{uid}")
+    if isinstance(record, dict):
+        _index_applicants({uid: record})
+    # Re-uploading the same file takes and drops a reference on one blob
+    release_resume(old_resume)
+    if resume and not old_resume:
+        release_legacy_resume(uid, old_url)
+    if resume:
+        resume_index.schedule(uid, data["resume_url"], data["resume_hash"])
 
 
 # Delete Functions
 
+# Above this many applicants a bulk delete scans /applications once
+# instead of running one indexed query per applicant.
+BULK_DELETE_SCAN_THRESHOLD = 25
+
 def delete_applicant(uid):
     """
     Delete an applicant and all their associated applications.
     """
-    # Remove the applicant record
-    db.reference(f"applicants/{uid}").delete()
+    delete_applicants([uid])
 
-    # Find and remove applications linked to this applicant
-    apps = get_applications_for_applicant(uid)
-    if not apps:
+def delete_applicants(uids):
+    """
+    Delete applicants and every application linked to them in a single
+    multi-path update, so no orphaned applications are left behind.
+    """
+    uids = set(uids)
+    if not uids:
         return
-    for app_id in apps:
-        delete_application(app_id)
-
-def delete_application(app_id: str) -> None:
+    # One keyed lookup gives both the existence count and the resumes
+    applicants = get_applicants(uids)
+    existing = len(applicants)
+    resumes = [record.get("resume_hash") for record in applicants.values()]
+    legacy = {uid: record.get("resume_url") for uid, record in applicants.items() if not record.get("resume_hash")}
+    if len(uids) > BULK_DELETE_SCAN_THRESHOLD:
+        all_apps = get_backend().get("applications") or {}
+        linked = {app_id: app for app_id, app in all_apps.items() if app.get("applicant_id") in uids}
+    else:
+        linked = {app_id: app for uid in uids for app_id, app in get_applications_for_applicant(uid).items()}
+
+    deleted_at = datetime.now(ZoneInfo("Asia/Kolkata")).isoformat()
+    updates = {}
+    for uid in uids:
+        updates[f"applicants/{uid}"] = None
+        if delta_sync_enabled():
+            # Leave a tombstone so other mirrors can drop the applicant
+            updates[f"deletions/applicants/{uid}"] = {"deleted_at": deleted_at}
+    for app_id in linked:
+        updates[f"applications/{app_id}"] = None
+    updates.update(increment_updates(merge_deltas(*(funnel_deltas(app, -1) for app in linked.values()))))
+    get_backend().update("/", updates)
+    invalidate("applicants", "applications")
+    _index_applicants({}, uids)
+    apply_deltas({"applicants": -existing})
+    invalidate("aggregates")
+    for digest in resumes:
+        release_resume(digest)
+    for uid, url in legacy.items():
+        release_legacy_resume(uid, url)
+    resume_index.remove(uids)
+
+def delete_application(app_id: str, current: dict = None) -> None:
     """
     Delete an application document from Firestore by ID.
     """
-    db.reference(f"applications/{app_id}").delete()
+    old = _current_applications([app_id], {app_id: current} if current else None)[app_id]
+    get_backend().update("/", {
+        f"applications/{app_id}": None,
+        **increment_updates(funnel_deltas(old, -1)),
+    })
+    invalidate("applications")
 
 if __name__ == "__main__":
     init_firebase()
@@ -0,0 +1,72 @@
+import os
+from bisect import bisect_left
+import threading
+from dotenv import load_dotenv
+from utils.storage import get_backend
+
+load_dotenv()
+
+
+class IdAllocator:
+    """
+    Hands out short numeric IDs without probing for collisions.
+
+    Each process reserves a block of IDs per node with one transaction on
+    counters/<path> and serves later inserts from memory. Counters start at
+    the smallest ID of the configured length, so IDs keep the old six-digit
+    format until that range is used up. Keys left by the old random
+    generator are read once per process with a shallow read and skipped,
+    so they are never reissued.
+    """
+
+    def __init__(self, block_size=20, length=6):
+        self.block_size = block_size
+        self.length = length
+        self._blocks = {}
+        self._taken = {}
+        self._lock = threading.Lock()
+
+    def _existing(self, backend, path):
+        # Every key at or above the counter predates the allocator, so one
+        # read per process is enough; later keys all come from counters.
+        if path not in self._taken:
+            keys = backend.get(path, shallow=True) or {}
+            self._taken[path] = sorted(int(k) for k in keys if str(k).isdigit())
+        return self._taken[path]
+
+    def _reserve(self, path, count):
+        backend = get_backend()
+        taken = self._existing(backend, path)
+
+        def bump(current):
+            start = current if current is not None else 10 ** (self.length - 1)
+            return start + count
+
+        end = backend.transaction(f"counters/{path}", bump)
+        start = end - count
+        # Drop legacy keys the counter has passed and skip those in range
+        del taken[:bisect_left(taken, start)]
+        skip = set(taken[:bisect_left(taken, end)])
+        return [n for n in range(start, end) if n not in skip]
+
+    def allocate(self, path, count=1):
+        """
+        Return count new IDs for the node at path, as zero-padded strings.
+        """
+        with self._lock:
+            free = self._blocks.setdefault(path, [])
+            while len(free) < count:
+                # Reserve enough for this request plus a block of spares,
+                # more if legacy keys fall inside the reserved range.
+                free.extend(self._reserve(path, count - len(free) + self.block_size))
+            ids = [str(n).zfill(self.length) for n in free[:count]]
+            del free[:count]
+        return ids
+
+    def reset(self):
+        with self._lock:
+            self._blocks.clear()
+            self._taken.clear()
+
+
+id_allocator = IdAllocator(block_size=int(os.environ.get("id_block_size", 20)))
@@ -0,0 +1,306 @@
+import argparse
+import csv
+import json
+import os
+import re
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from utils.storage import get_backend
+from utils.cache import invalidate
+from utils.ids import id_allocator
+from utils.aggregates import apply_deltas, job_deltas, merge_deltas, rebuild_aggregates
+from utils.normalize import normalized_fields
+from utils.validation import validate_applicant, validate_job, APPLICANT_NUMBERS, JOB_NUMBERS
+
+try:
+    import openpyxl
+except ImportError:  # .xlsx imports need `pip install openpyxl`
+    openpyxl = None
+
+# Bulk import of applicants or jobs from CSV/XLSX. Rows are streamed and
+# committed in batches: each batch gets its IDs from one allocator call and
+# is written, together with any new skills/education entries, in one
+# multi-path update; new clients are claimed by transaction just before.
+# Progress is checkpointed to <file>.<kind>.checkpoint.json after every
+# batch so an interrupted import can pick up where it stopped.
+#
+#   python -m utils.importer applicants applicants.csv [--batch 500]
+
+BATCH_SIZE = 500
+FIXED_STAGES = ("applied", "selected", "offered")
+
+APPLICANT_FIELDS = [
+    "name", "phone", "email", "course", "specialization", "institute", "skills",
+    "city", "state", "country", "current_mode", "current_duration", "preferred_mode",
+    "preferred_duration", "source", "experience", "notice_period", "current_ctc",
+    "expected_ctc", "resume_url",
+]
+JOB_FIELDS = [
+    "job_title", "department", "location", "work_mode", "experience_required", "budget",
+    "vacancies", "skills", "hiring_process", "job_duration", "description",
+    "responsibilities", "benefits", "qualifications", "client", "contact_person",
+    "contact", "posted_by", "status",
+]
+HEADER_ALIASES = {
+    "full_name": "name",
+    "email_address": "email",
+    "phone_number": "phone",
+    "total_experience": "experience",
+    "years_of_experience": "experience",
+    "title": "job_title",
+    "ctc": "current_ctc",
+}
+
+
+def _header(name):
+    key = re.sub(r"[\s\-]+", "_", str(name or "").strip().lower())
+    return HEADER_ALIASES.get(key, key)
+
+
+def read_rows(path):
+    """
+    Yield each data row of a .csv or .xlsx file as {field: value}, one at
+    a time, with headers normalized to record field names.
+    """
+    if path.lower().endswith((".xlsx", ".xlsm")):
+        if openpyxl is None:
+            raise RuntimeError("openpyxl is required to import .xlsx files")
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            headers = [_header(h) for h in next(rows, [])]
+            for values in rows:
+                if any(v not in (None, "") for v in values):
+                    yield dict(zip(headers, values))
+        finally:
+            workbook.close()
+    else:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.reader(f)
+            headers = [_header(h) for h in next(reader, [])]
+            for values in reader:
+                if any(values):
+                    yield dict(zip(headers, values))
+
+
+def count_rows(path):
+    """
+    Rough number of data rows in path, for progress reporting.
+    """
+    if path.lower().endswith((".xlsx", ".xlsm")):
+        workbook = openpyxl.load_workbook(path, read_only=True)
+        try:
+            return max((workbook.active.max_row or 1) - 1, 0)
+        finally:
+            workbook.close()
+    with open(path, "rb") as f:
+        return max(sum(1 for _ in f) - 1, 0)
+
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def parse_skill_years(value):
+    """
+    Parse "Python: 2.5; SQL (1); Docker" into {"Python": 2.5, "SQL": 1.0, "Docker": 0.0}.
+    """
+    skills = {}
+    for part in re.split(r"[;,\n]", _text(value)):
+        match = re.match(r"^\s*(.+?)\s*(?:[:=]\s*|\()\s*(\d+(?:\.\d+)?)\s*\)?\s*$", part)
+        if match:
+            skills[match.group(1)] = float(match.group(2))
+        elif part.strip():
+            skills[part.strip()] = 0.0
+    return skills
+
+
+def _list(value):
+    return [v.strip() for v in re.split(r"[;,\n]", _text(value)) if v.strip()]
+
+
+def applicant_from_row(row):
+    record = {k: _text(row.get(k)) for k in APPLICANT_FIELDS if _text(row.get(k))}
+    if "skills" in record:
+        record["skills"] = parse_skill_years(record["skills"])
+    return record
+
+
+def job_from_row(row):
+    record = {k: _text(row.get(k)) for k in JOB_FIELDS if _text(row.get(k))}
+    if "skills" in record:
+        record["skills"] = _list(record["skills"])
+    # Same stage list the Add Job form builds: applications start at
+    # "applied" and end at "selected" and "offered"
+    stages = [s for s in _list(record.get("hiring_process")) if s.lower() not in FIXED_STAGES]
+    record["hiring_process"] = ["applied"] + stages + ["selected", "offered"]
+    record["status"] = record.get("status", "open").lower()
+    return record
+
+
+def _finish_applicant(record, now):
+    for key in APPLICANT_NUMBERS:
+        if key in record:
+            record[key] = float(record[key])
+    record["created_at"] = record["updated_at"] = now
+    record.update(normalized_fields(record))
+    return record
+
+
+def _finish_job(record, now):
+    for key in JOB_NUMBERS:
+        if key in record:
+            record[key] = float(record[key])
+    if "vacancies" in record:
+        record["vacancies"] = int(record["vacancies"])
+    record["posted_at"] = now
+    return record
+
+
+KINDS = {
+    "applicants": (applicant_from_row, validate_applicant, _finish_applicant),
+    "jobs": (job_from_row, validate_job, _finish_job),
+}
+
+
+def _vocabulary_updates(kind, records):
+    from utils.firebase_helper import vocabulary_updates, education_updates
+    updates = vocabulary_updates("skills", {s for r in records for s in r.get("skills") or []})
+    if kind == "applicants":
+        for r in records:
+            updates.update(education_updates(r.get("course", ""), r.get("specialization", "")))
+    return updates
+
+
+class Checkpoint:
+    """
+    Import progress saved next to the source file. A batch is recorded as
+    pending, with its first ID, before it is written; on resume a pending
+    batch whose first record exists is treated as committed, and the
+    aggregates are rebuilt since its counter update may not have landed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.state = {"rows_done": 0, "imported": 0, "errors": 0, "pending": None}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.state.update(json.load(f))
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.path)
+
+    def recover(self, kind):
+        pending = self.state.get("pending")
+        if pending and get_backend().get(f"{kind}/{pending['first_id']}") is not None:
+            self.state["rows_done"] = pending["rows_done"]
+            self.state["imported"] += pending["count"]
+            self.state["errors"] = pending["errors"]
+            rebuild_aggregates()
+        self.state["pending"] = None
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def import_file(path, kind, batch_size=BATCH_SIZE, progress=None, restart=False, checkpoint_path=None):
+    """
+    Import every row of path as kind ("applicants" or "jobs").
+
+    progress(rows_done, imported, errors) is called after each batch and
+    rows rejected in this run are returned as [(row number, [problems])].
+    Re-running after an interruption continues from the last committed
+    batch unless restart is set.
+    """
+    to_record, validate, finish = KINDS[kind]
+    checkpoint = Checkpoint(checkpoint_path or f"{path}.{kind}.checkpoint.json")
+    if restart:
+        checkpoint.clear()
+        checkpoint = Checkpoint(checkpoint.path)
+    checkpoint.recover(kind)
+    state = checkpoint.state
+    skip = state["rows_done"]
+
+    from utils.firebase_helper import get_clients, add_clients
+    known_clients = set(get_clients())
+    rejected = []
+    batch = []
+
+    def commit(rows_done):
+        now = datetime.now(ZoneInfo("Asia/Kolkata")).isoformat()
+        records = [finish(record, now) for record in batch]
+        ids = id_allocator.allocate(kind, len(records)) if records else []
+        updates = _vocabulary_updates(kind, records)
+        for record_id, record in zip(ids, records):
+            record["id"] = record_id
+            updates[f"{kind}/{record_id}"] = record
+
+        if ids and kind == "jobs":
+            # Clients are claimed one key at a time, like add_clients, so
+            # only the writer that creates a client counts it; a client
+            # without jobs is harmless if the batch write then fails
+            new_clients = {r["client"] for r in records if r.get("client")} - known_clients
+            add_clients(sorted(new_clients))
+            known_clients.update(new_clients)
+        if ids:
+            state["pending"] = {"first_id": ids[0], "rows_done": rows_done, "count": len(ids), "errors": state["errors"]}
+            checkpoint.save()
+            get_backend().update("/", updates)
+            if kind == "applicants":
+                apply_deltas({"applicants": len(ids)})
+            else:
+                apply_deltas(merge_deltas(*(job_deltas(r) for r in records)))
+        state.update(rows_done=rows_done, imported=state["imported"] + len(ids), pending=None)
+        checkpoint.save()
+        batch.clear()
+        if progress:
+            progress(state["rows_done"], state["imported"], state["errors"])
+
+    rows_done = 0
+    for rows_done, row in enumerate(read_rows(path), start=1):
+        if rows_done <= skip:
+            continue
+        record = to_record(row)
+        problems = validate(record)
+        if problems:
+            state["errors"] += 1
+            rejected.append((rows_done + 1, problems))  # +1 for the header line
+            continue
+        batch.append(record)
+        if len(batch) >= batch_size:
+            commit(rows_done)
+    if rows_done > skip or batch:
+        commit(max(rows_done, skip))
+
+    invalidate(kind, "skills", "clients", "education", "aggregates")
+    return state["imported"], rejected
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import applicants or jobs from CSV/XLSX")
+    parser.add_argument("kind", choices=sorted(KINDS))
+    parser.add_argument("path")
+    parser.add_argument("--batch", type=int, default=BATCH_SIZE)
+    parser.add_argument("--restart", action="store_true", help="ignore any saved checkpoint")
+    args = parser.parse_args()
+
+    from utils.firebase_helper import init_firebase
+    init_firebase()
+
+    def report(rows_done, imported, errors):
+        print(f"\r{rows_done} rows read, {imported} imported, {errors} rejected", end="", flush=True)
+
+    imported, rejected = import_file(args.path, args.kind, args.batch, progress=report, restart=args.restart)
+    print()
+    for line, problems in rejected[:50]:
+        print(f"row {line}: {'; '.join(problems)}")
+    if len(rejected) > 50:
+        print(f"... and {len(rejected) - 50} more rejected rows")
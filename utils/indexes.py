@@ -0,0 +1,539 @@
+import heapq
+import threading
+import numpy as np
+import pandas as pd
+
+CHUNK_BITS = 1 << 16
+CHUNK_BYTES = CHUNK_BITS // 8
+# Chunks with up to this many members are stored as sorted uint16 arrays
+# (2 bytes per member); fuller ones as 8 KB bitmaps.
+ARRAY_MAX = 4096
+
+
+def _unpack(bits):
+    return np.unpackbits(np.frombuffer(bits.to_bytes(CHUNK_BYTES, "little"), dtype=np.uint8), bitorder="little")
+
+
+def _bits_to_array(bits):
+    return np.flatnonzero(_unpack(bits)).astype(np.uint16)
+
+
+def _array_to_bits(values):
+    mask = np.zeros(CHUNK_BITS, dtype=bool)
+    mask[values] = True
+    return int.from_bytes(np.packbits(mask, bitorder="little").tobytes(), "little")
+
+
+def _from_array(values):
+    return values if len(values) <= ARRAY_MAX else _array_to_bits(values)
+
+
+def _from_bits(bits):
+    return bits if bits.bit_count() > ARRAY_MAX else _bits_to_array(bits)
+
+
+def _size(chunk):
+    return chunk.bit_count() if isinstance(chunk, int) else len(chunk)
+
+
+def _and(a, b):
+    if isinstance(a, int) and isinstance(b, int):
+        return _from_bits(a & b)
+    if isinstance(a, int):
+        a, b = b, a
+    if isinstance(b, int):
+        return a[_unpack(b)[a].astype(bool)]
+    return np.intersect1d(a, b, assume_unique=True)
+
+
+def _or(a, b):
+    if isinstance(a, int) and isinstance(b, int):
+        return a | b
+    if isinstance(a, int):
+        a, b = b, a
+    if isinstance(b, int):
+        return b | _array_to_bits(a)
+    return _from_array(np.union1d(a, b))
+
+
+class Bitset:
+    """
+    Compressed set of non-negative integers, split roaring-style into
+    65536-value chunks. Only non-empty chunks are stored; a chunk with at
+    most ARRAY_MAX members is a sorted uint16 array and a fuller one a
+    65536-bit bitmap (a Python int), so sparse sets cost two bytes per
+    member and dense ones one bit.
+    """
+
+    __slots__ = ("chunks",)
+
+    def __init__(self, chunks=None):
+        self.chunks = chunks or {}
+
+    def add(self, n):
+        hi, lo = divmod(n, CHUNK_BITS)
+        chunk = self.chunks.get(hi)
+        if chunk is None:
+            self.chunks[hi] = np.array([lo], dtype=np.uint16)
+        elif isinstance(chunk, int):
+            self.chunks[hi] = chunk | (1 << lo)
+        else:
+            i = int(np.searchsorted(chunk, lo))
+            if i < len(chunk) and chunk[i] == lo:
+                return
+            self.chunks[hi] = _from_array(np.insert(chunk, i, lo))
+
+    def discard(self, n):
+        hi, lo = divmod(n, CHUNK_BITS)
+        chunk = self.chunks.get(hi)
+        if chunk is None:
+            return
+        if isinstance(chunk, int):
+            chunk = _from_bits(chunk & ~(1 << lo))
+        else:
+            i = int(np.searchsorted(chunk, lo))
+            if i == len(chunk) or chunk[i] != lo:
+                return
+            chunk = np.delete(chunk, i)
+        if _size(chunk):
+            self.chunks[hi] = chunk
+        else:
+            del self.chunks[hi]
+
+    def __and__(self, other):
+        chunks = {}
+        for hi, chunk in self.chunks.items():
+            if hi in other.chunks:
+                both = _and(chunk, other.chunks[hi])
+                if _size(both):
+                    chunks[hi] = both
+        return Bitset(chunks)
+
+    def __or__(self, other):
+        chunks = dict(self.chunks)
+        for hi, chunk in other.chunks.items():
+            chunks[hi] = _or(chunks[hi], chunk) if hi in chunks else chunk
+        return Bitset(chunks)
+
+    def __len__(self):
+        return sum(_size(chunk) for chunk in self.chunks.values())
+
+    def __bool__(self):
+        return bool(self.chunks)
+
+    def to_mask(self, size):
+        """
+        Return a numpy bool array of length size with the members set.
+        """
+        mask = np.zeros(size, dtype=bool)
+        for hi, chunk in self.chunks.items():
+            start = hi * CHUNK_BITS
+            if start >= size:
+                continue
+            if isinstance(chunk, int):
+                end = min(start + CHUNK_BITS, size)
+                mask[start:end] = _unpack(chunk)[: end - start].astype(bool)
+            else:
+                values = chunk.astype(np.int64) + start
+                mask[values[values < size]] = True
+        return mask
+
+    def count_in(self, mask):
+        """
+        Number of members set in the numpy bool array mask.
+        """
+        count = 0
+        for hi, chunk in self.chunks.items():
+            start = hi * CHUNK_BITS
+            if start >= len(mask):
+                continue
+            if isinstance(chunk, int):
+                window = mask[start:start + CHUNK_BITS]
+                count += int(np.count_nonzero(window & _unpack(chunk)[: len(window)].astype(bool)))
+            else:
+                values = chunk.astype(np.int64) + start
+                count += int(np.count_nonzero(mask[values[values < len(mask)]]))
+        return count
+
+    def members(self):
+        members = []
+        for hi, chunk in sorted(self.chunks.items()):
+            values = _bits_to_array(chunk) if isinstance(chunk, int) else chunk
+            members.extend((values.astype(np.int64) + hi * CHUNK_BITS).tolist())
+        return members
+
+    @classmethod
+    def from_sorted(cls, members):
+        """
+        Build from a numpy array of sorted, distinct non-negative integers.
+        """
+        members = np.asarray(members, dtype=np.int64)
+        chunks = {}
+        if len(members):
+            first, last = int(members[0]) >> 16, int(members[-1]) >> 16
+            starts = np.searchsorted(members, np.arange(first + 1, last + 1) << 16).tolist()
+            low = (members & 0xFFFF).astype(np.uint16)
+            for hi, start, end in zip(range(first, last + 1), [0] + starts, starts + [len(members)]):
+                if end > start:
+                    chunks[hi] = _from_array(low[start:end])
+        return cls(chunks)
+
+    @classmethod
+    def from_members(cls, members):
+        return cls.from_sorted(np.unique(np.fromiter(members, dtype=np.int64)))
+
+
+class BitmapIndex:
+    """
+    Secondary index from field value to the set of record keys holding it,
+    stored as Bitsets over stable per-key ordinals. Kept up to date
+    incrementally from a NodeMirror subscription and by the write helpers.
+    """
+
+    def __init__(self, fields):
+        # fields maps index name -> record key
+        self.fields = fields
+        self._lock = threading.RLock()
+        # Bumped on every change, so cached ordinal sets can be keyed on it
+        self.generation = 0
+        self._clear()
+
+    def _clear(self):
+        self.ordinals = {}
+        self.keys = []
+        self._free = []
+        self.bitmaps = {name: {} for name in self.fields}
+        # Per field, the indexed value of each ordinal (None when free)
+        self._values = {name: [] for name in self.fields}
+        self.all = Bitset()
+
+    def _value(self, record, field):
+        value = record.get(field, "")
+        return "" if value is None else str(value)
+
+    def _remove(self, key):
+        ordinal = self.ordinals.pop(key, None)
+        if ordinal is None:
+            return
+        for name, values in self._values.items():
+            bitmap = self.bitmaps[name].get(values[ordinal])
+            if bitmap is not None:
+                bitmap.discard(ordinal)
+                if not bitmap:
+                    del self.bitmaps[name][values[ordinal]]
+            values[ordinal] = None
+        self.all.discard(ordinal)
+        self.keys[ordinal] = None
+        self._free.append(ordinal)
+
+    def _upsert(self, key, record):
+        self._remove(key)
+        if self._free:
+            ordinal = self._free.pop()
+            self.keys[ordinal] = key
+        else:
+            ordinal = len(self.keys)
+            self.keys.append(key)
+            for values in self._values.values():
+                values.append(None)
+        self.ordinals[key] = ordinal
+        for name, field in self.fields.items():
+            value = self._value(record, field)
+            self._values[name][ordinal] = value
+            self.bitmaps[name].setdefault(value, Bitset()).add(ordinal)
+        self.all.add(ordinal)
+
+    def _bulk_load(self, records):
+        self._clear()
+        self.keys = [key for key, record in records.items() if isinstance(record, dict)]
+        self.ordinals = {key: ordinal for ordinal, key in enumerate(self.keys)}
+        for name, field in self.fields.items():
+            # Group ordinals by value in one sort; each group comes out sorted
+            raw = np.empty(len(self.keys), dtype=object)
+            raw[:] = [records[key].get(field) for key in self.keys]
+            codes, uniques = pd.factorize(raw)
+            # Missing values (code -1) index as "", and values that print
+            # the same (5 and "5") share one bitmap
+            labels = ["" if value is None else str(value) for value in uniques] + [""]
+            slots = {}
+            codes = np.array([slots.setdefault(label, len(slots)) for label in labels])[codes]
+            labels = list(slots)
+            order = np.argsort(codes, kind="stable")
+            ends = np.cumsum(np.bincount(codes, minlength=len(labels))).tolist()
+            self._values[name] = [labels[code] for code in codes.tolist()]
+            self.bitmaps[name] = {
+                label: Bitset.from_sorted(order[start:end])
+                for label, start, end in zip(labels, [0] + ends, ends) if end > start
+            }
+        self.all = Bitset.from_sorted(np.arange(len(self.keys)))
+
+    def apply(self, updated, removed, reset=False):
+        """
+        NodeMirror listener: fold changed and removed records into the index.
+        """
+        with self._lock:
+            self.generation += 1
+            if reset:
+                self._bulk_load(updated)
+                return
+            for key in removed:
+                self._remove(key)
+            for key, record in updated.items():
+                if isinstance(record, dict):
+                    self._upsert(key, record)
+
+    def rebuild(self, records):
+        self.apply(records, [], reset=True)
+
+    def covers(self, keys):
+        with self._lock:
+            return all(key in self.ordinals for key in keys)
+
+    def bitset_for(self, keys):
+        with self._lock:
+            return Bitset.from_members(self.ordinals[key] for key in keys if key in self.ordinals)
+
+    def ordinals_for(self, keys):
+        with self._lock:
+            return np.fromiter((self.ordinals.get(key, -1) for key in keys), dtype=np.int64)
+
+    def match(self, name, values):
+        """
+        Bitset of records whose field equals any of values.
+        """
+        with self._lock:
+            result = Bitset()
+            for value in values:
+                bitmap = self.bitmaps[name].get(value)
+                if bitmap is not None:
+                    result = result | bitmap
+            return result
+
+    def option_counts(self, name, within=None):
+        """
+        Return {value: number of records} for a field, optionally limited to
+        the records in the within bitset. Values with no records are omitted.
+        """
+        with self._lock:
+            counts = {}
+            mask = within.to_mask(len(self.keys)) if within is not None else None
+            for value, bitmap in self.bitmaps[name].items():
+                count = bitmap.count_in(mask) if mask is not None else len(bitmap)
+                if count:
+                    counts[value] = count
+            return counts
+
+    def size(self):
+        return len(self.keys)
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+# Texts are turned into trigram codes this many at a time, bounding the
+# padded character matrix
+GRAM_BATCH = 4096
+
+
+def trigram_postings(texts):
+    """
+    Return {trigram: sorted int32 array of the positions of texts holding
+    it}, computed with array operations over the texts' code points.
+    """
+    codes, positions = [], []
+    for start in range(0, len(texts), GRAM_BATCH):
+        batch = texts[start:start + GRAM_BATCH]
+        width = max(map(len, batch))
+        if width < 3:
+            continue
+        chars = np.array(batch, dtype=f"<U{width}").view(np.uint32).reshape(len(batch), width).astype(np.uint64)
+        # Code points fit in 21 bits, so three of them pack into one integer
+        grams = (chars[:, :-2] << np.uint64(42)) | (chars[:, 1:-1] << np.uint64(21)) | chars[:, 2:]
+        present = chars[:, 2:] != 0
+        codes.append(grams[present])
+        positions.append((np.nonzero(present)[0] + start).astype(np.int32))
+    if not codes:
+        return {}
+    codes, positions = np.concatenate(codes), np.concatenate(positions)
+    # Positions are generated in order, so a stable sort keeps them sorted
+    order = np.argsort(codes, kind="stable")
+    codes, positions = codes[order], positions[order]
+    # Drop repeats of a trigram within one text, then split by trigram
+    keep = np.ones(len(codes), dtype=bool)
+    keep[1:] = (codes[1:] != codes[:-1]) | (positions[1:] != positions[:-1])
+    codes, positions = codes[keep], positions[keep]
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]).tolist()
+    postings = {}
+    for start, end in zip(starts, starts[1:] + [len(codes)]):
+        code = int(codes[start])
+        gram = chr(code >> 42) + chr((code >> 21) & 0x1FFFFF) + chr(code & 0x1FFFFF)
+        postings[gram] = positions[start:end].copy()
+    return postings
+
+
+class TrigramIndex:
+    """
+    Substring and typo-tolerant search over a few text fields. Each field
+    keeps trigram -> sorted int32 array postings over record ordinals;
+    substring hits come from intersecting the query's trigrams and are
+    verified against the stored text, fuzzy hits are ranked by the share
+    of query trigrams they contain.
+
+    The first full load is deferred until the first search, so pages that
+    never search do not pay for building it.
+    """
+
+    def __init__(self, fields, min_similarity=0.5):
+        # fields maps index name -> record key (None means the record key)
+        self.fields = fields
+        self.min_similarity = min_similarity
+        self._lock = threading.RLock()
+        self._pending = {}
+        self._built = False
+        self._clear()
+
+    def _clear(self):
+        self.ordinals = {}
+        self.keys = []
+        self._free = []
+        self.texts = {name: [] for name in self.fields}
+        self.postings = {name: {} for name in self.fields}
+
+    def _text(self, key, record, field):
+        value = key if field is None else record.get(field, "")
+        return "" if value is None else str(value).lower()
+
+    def _remove(self, key):
+        ordinal = self.ordinals.pop(key, None)
+        if ordinal is None:
+            return
+        for name in self.fields:
+            postings = self.postings[name]
+            for gram in trigrams(self.texts[name][ordinal]):
+                posting = postings.get(gram)
+                if posting is None:
+                    continue
+                i = int(np.searchsorted(posting, ordinal))
+                if i < len(posting) and posting[i] == ordinal:
+                    posting = np.delete(posting, i)
+                    if len(posting):
+                        postings[gram] = posting
+                    else:
+                        del postings[gram]
+            self.texts[name][ordinal] = ""
+        self.keys[ordinal] = None
+        self._free.append(ordinal)
+
+    def _upsert(self, key, record):
+        self._remove(key)
+        if self._free:
+            ordinal = self._free.pop()
+            self.keys[ordinal] = key
+        else:
+            ordinal = len(self.keys)
+            self.keys.append(key)
+            for name in self.fields:
+                self.texts[name].append("")
+        self.ordinals[key] = ordinal
+        for name, field in self.fields.items():
+            text = self._text(key, record, field)
+            self.texts[name][ordinal] = text
+            postings = self.postings[name]
+            for gram in trigrams(text):
+                posting = postings.get(gram)
+                if posting is None:
+                    postings[gram] = np.array([ordinal], dtype=np.int32)
+                else:
+                    postings[gram] = np.insert(posting, int(np.searchsorted(posting, ordinal)), ordinal)
+
+    def _bulk_load(self, records):
+        self._clear()
+        self.keys = [key for key, record in records.items() if isinstance(record, dict)]
+        self.ordinals = {key: ordinal for ordinal, key in enumerate(self.keys)}
+        for name, field in self.fields.items():
+            self.texts[name] = [self._text(key, records[key], field) for key in self.keys]
+            self.postings[name] = trigram_postings(self.texts[name])
+        self._built = True
+
+    def apply(self, updated, removed, reset=False):
+        """
+        NodeMirror listener: fold changed and removed records into the index.
+        """
+        with self._lock:
+            if reset:
+                self._pending = dict(updated)
+                self._built = False
+                self._clear()
+                return
+            if not self._built:
+                for key in removed:
+                    self._pending.pop(key, None)
+                self._pending.update(updated)
+                return
+            for key in removed:
+                self._remove(key)
+            for key, record in updated.items():
+                if isinstance(record, dict):
+                    self._upsert(key, record)
+
+    def rebuild(self, records):
+        self.apply(records, [], reset=True)
+
+    def _ensure_built(self):
+        if not self._built:
+            self._bulk_load(self._pending)
+            self._pending = {}
+
+    def _rank(self, text, query):
+        if text == query:
+            return 3.0
+        if text.startswith(query):
+            return 2.0
+        return 1.0
+
+    def search(self, query, fields=None, limit=50, fuzzy=True):
+        """
+        Return [(key, score)] best first. Exact matches score 3, prefix
+        matches 2, other substring matches 1 and fuzzy matches their
+        trigram similarity (between min_similarity and 1).
+        """
+        query = (query or "").strip().lower()
+        if not query:
+            return []
+        fields = fields or list(self.fields)
+        with self._lock:
+            self._ensure_built()
+            scores = {}
+            grams = trigrams(query)
+            for name in fields:
+                texts, postings = self.texts[name], self.postings[name]
+                if not grams:
+                    # Too short for trigrams: scan the stored text instead
+                    candidates = [i for i, text in enumerate(texts) if query in text]
+                else:
+                    hit = None
+                    # Intersect from the shortest posting up
+                    for posting in sorted((postings.get(gram) for gram in grams), key=lambda p: -1 if p is None else len(p)):
+                        if posting is None:
+                            hit = np.empty(0, dtype=np.int32)
+                            break
+                        hit = posting if hit is None else np.intersect1d(hit, posting, assume_unique=True)
+                    candidates = [i for i in hit.tolist() if query in texts[i]]
+                for i in candidates:
+                    scores[i] = max(scores.get(i, 0), self._rank(texts[i], query))
+
+                if fuzzy and grams and (limit is None or len(scores) < limit):
+                    counts = np.zeros(len(self.keys), dtype=np.int32)
+                    for gram in grams:
+                        posting = postings.get(gram)
+                        if posting is not None:
+                            counts[posting] += 1
+                    similarity = counts / len(grams)
+                    for i in np.flatnonzero(similarity >= self.min_similarity).tolist():
+                        if self.keys[i] is not None and i not in scores:
+                            scores[i] = float(similarity[i]) * 0.99
+
+            ranked = heapq.nlargest(limit, scores.items(), key=lambda item: item[1]) if limit else \
+                sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            return [(self.keys[i], score) for i, score in ranked if self.keys[i] is not None]
@@ -0,0 +1,163 @@
+import re
+import numpy as np
+import pandas as pd
+
+# Relative weight of each part of the match score; the parts are all in
+# [0, 1] so the total is too.
+WEIGHTS = {
+    "skills": 0.5,
+    "experience": 0.2,
+    "preference": 0.15,
+    "ctc": 0.15,
+}
+
+_BUDGET_UNITS = {
+    "k": 1e3,
+    "l": 1e5, "lpa": 1e5, "lac": 1e5, "lacs": 1e5, "lakh": 1e5, "lakhs": 1e5,
+    "cr": 1e7, "crore": 1e7, "crores": 1e7,
+}
+
+
+def parse_budget(text):
+    """
+    Parse a free-text annual budget such as "8-12 LPA", "10 lakh" or
+    "1200000" into (low, high) rupees. Returns None if there is no number.
+    """
+    if isinstance(text, (int, float)):
+        return (float(text), float(text)) if text > 0 else None
+    text = str(text or "").lower().replace(",", "")
+    numbers = [float(n) for n in re.findall(r"\d+(?:\.\d+)?", text)]
+    if not numbers:
+        return None
+    unit = re.search(r"\d\s*([a-z]+)", text)
+    scale = _BUDGET_UNITS.get(unit.group(1), 1) if unit else 1
+    if scale == 1 and max(numbers) < 1000:
+        # Bare small numbers are written in lakhs, as in the job form
+        scale = 1e5
+    values = [n * scale for n in numbers[:2]]
+    return min(values), max(values)
+
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class CandidateMatrix:
+    """
+    Column-oriented snapshot of applicant records for scoring against a
+    job. Skills are stored per skill as (ordinals, years) arrays, so a job
+    only touches the columns of the skills it asks for.
+    """
+
+    def __init__(self, records):
+        items = [(key, rec) for key, rec in records.items() if isinstance(rec, dict)]
+        self.keys = np.array([key for key, _ in items], dtype=object)
+        self.ordinals = {key: i for i, (key, _) in enumerate(items)}
+        self.experience = np.array([_float(rec.get("experience")) for _, rec in items], dtype=np.float64)
+        self.expected_ctc = np.array([_float(rec.get("expected_ctc")) for _, rec in items], dtype=np.float64)
+        self.preferred_mode = np.array([str(rec.get("preferred_mode") or "").lower() for _, rec in items])
+        self.preferred_duration = np.array([str(rec.get("preferred_duration") or "").lower() for _, rec in items])
+
+        columns = {}
+        for i, (_, rec) in enumerate(items):
+            skills = rec.get("skills")
+            if not isinstance(skills, dict):
+                continue
+            for skill, years in skills.items():
+                column = columns.setdefault(str(skill).strip().lower(), ([], []))
+                column[0].append(i)
+                column[1].append(_float(years))
+        self.skills = {
+            skill: (np.array(ords, dtype=np.int64), np.nan_to_num(np.array(years, dtype=np.float64)))
+            for skill, (ords, years) in columns.items()
+        }
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _skill_scores(self, job):
+        required = {str(s).strip().lower() for s in job.get("skills") or [] if s}
+        if not required:
+            return np.ones(len(self))
+        # Having a skill is worth half; the rest scales with years in it up
+        # to the job's experience requirement (at least one year).
+        target = max(np.nan_to_num(_float(job.get("experience_required"))), 1.0)
+        total = np.zeros(len(self))
+        for skill in required:
+            column = self.skills.get(skill)
+            if column is not None:
+                ords, years = column
+                total[ords] += 0.5 + 0.5 * np.minimum(years / target, 1.0)
+        return total / len(required)
+
+    def _experience_scores(self, job):
+        required = _float(job.get("experience_required"))
+        if not required or np.isnan(required) or required <= 0:
+            return np.ones(len(self))
+        return np.clip(np.nan_to_num(self.experience) / required, 0.0, 1.0)
+
+    def _preference_scores(self, job):
+        mode = str(job.get("work_mode") or "").lower()
+        duration = str(job.get("job_duration") or "").lower()
+        if mode:
+            # Hybrid sits halfway between onsite and remote
+            mode_score = np.where(self.preferred_mode == mode, 1.0,
+                                  np.where((self.preferred_mode == "hybrid") | (mode == "hybrid"), 0.5, 0.0))
+        else:
+            mode_score = np.ones(len(self))
+        if duration:
+            # "Contractual" matches "Contractual (6+6)" and the like
+            kind = duration.split("(")[0].strip()
+            duration_score = (self.preferred_duration == kind).astype(np.float64)
+        else:
+            duration_score = np.ones(len(self))
+        return 0.5 * mode_score + 0.5 * duration_score
+
+    def _ctc_scores(self, job):
+        budget = parse_budget(job.get("budget"))
+        if budget is None:
+            return np.ones(len(self))
+        high = budget[1]
+        expected = self.expected_ctc
+        # Within budget scores 1, then falls linearly to 0 at twice the top
+        # of the range. Unknown expectations are neutral.
+        scores = np.clip(1.0 - (expected - high) / high, 0.0, 1.0)
+        return np.where(np.isnan(expected) | (expected <= 0), 0.5, scores)
+
+    def score(self, job):
+        """
+        Return {"score": total, <part>: scores} as arrays aligned with keys.
+        """
+        parts = {
+            "skills": self._skill_scores(job),
+            "experience": self._experience_scores(job),
+            "preference": self._preference_scores(job),
+            "ctc": self._ctc_scores(job),
+        }
+        parts["score"] = sum(WEIGHTS[name] * values for name, values in parts.items())
+        return parts
+
+    def top_k(self, job, k=50, keys=None):
+        """
+        Return a DataFrame of the k best candidates for job, indexed by
+        applicant id and ordered best first, with the total score and its
+        parts. keys limits the ranking to those applicants.
+        """
+        parts = self.score(job)
+        total = parts["score"]
+        if keys is not None:
+            ordinals = np.fromiter((self.ordinals.get(key, -1) for key in keys), dtype=np.int64)
+            ordinals = ordinals[ordinals >= 0]
+        else:
+            ordinals = np.arange(len(self))
+        if k and len(ordinals) > k:
+            best = np.argpartition(-total[ordinals], k - 1)[:k]
+            ordinals = ordinals[best]
+        ordinals = ordinals[np.argsort(-total[ordinals], kind="stable")]
+        return pd.DataFrame(
+            {name: values[ordinals] for name, values in parts.items()},
+            index=pd.Index(self.keys[ordinals], name="UUID"),
+        )[["score", *WEIGHTS]]
@@ -0,0 +1,97 @@
+from datetime import datetime
+from utils.storage import get_backend
+
+# Typed copies of applicant fields that the UI would otherwise parse on
+# every render. They are written by add_applicant/update_applicant:
+#
+#   notice_months              notice period in months (99 if unknown)
+#   experience                 total years, float
+#   current_ctc, expected_ctc  annual CTC in rupees, float
+#   created_ts, updated_ts     epoch seconds of created_at/updated_at
+#
+# Run `python -m utils.normalize` once to backfill existing applicants.
+# Running app processes should be restarted afterwards, since backfilled
+# records keep their updated_at and are not picked up by delta sync.
+
+NOTICE_MONTHS = {
+    "Immediate": 0,
+    "1 Month": 1,
+    "2 Months": 2,
+    "3 Months": 3,
+}
+UNKNOWN_NOTICE = 99
+NUMBER_FIELDS = ("experience", "current_ctc", "expected_ctc")
+TIMESTAMP_FIELDS = {"created_at": "created_ts", "updated_at": "updated_ts"}
+BACKFILL_BATCH = 500
+
+
+def parse_notice_period(val):
+    if val in NOTICE_MONTHS:
+        return NOTICE_MONTHS[val]
+    try:
+        # Extract number if possible from string like "6 months"
+        return int(''.join(filter(str.isdigit, val)))
+    except (TypeError, ValueError):
+        return UNKNOWN_NOTICE  # default high value for unknowns
+
+
+def to_number(val):
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def to_epoch(val):
+    try:
+        return datetime.fromisoformat(val).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def normalized_fields(data):
+    """
+    Return the typed fields derived from the raw fields present in data.
+    Partial updates only get the fields they touch.
+    """
+    fields = {}
+    if "notice_period" in data:
+        fields["notice_months"] = parse_notice_period(data["notice_period"])
+    for key in NUMBER_FIELDS:
+        if key in data:
+            fields[key] = to_number(data[key])
+    for key, ts_key in TIMESTAMP_FIELDS.items():
+        if key in data:
+            fields[ts_key] = to_epoch(data[key])
+    return fields
+
+
+def backfill_applicants(batch=BACKFILL_BATCH):
+    """
+    Add the typed fields to every applicant whose stored values differ,
+    writing batch records per multi-path update. Returns the number of
+    applicants changed.
+    """
+    backend = get_backend()
+    applicants = backend.get("applicants") or {}
+    updates, changed = {}, 0
+    for uid, record in applicants.items():
+        if not isinstance(record, dict):
+            continue
+        fields = {k: v for k, v in normalized_fields(record).items() if record.get(k) != v}
+        if not fields:
+            continue
+        changed += 1
+        updates.update({f"applicants/{uid}/{k}": v for k, v in fields.items()})
+        if changed % batch == 0:
+            backend.update("/", updates)
+            updates = {}
+    if updates:
+        backend.update("/", updates)
+    return changed
+
+
+if __name__ == "__main__":
+    from utils.firebase_helper import init_firebase
+    init_firebase()
+    print(f"Normalized {backfill_applicants()} applicant(s)")
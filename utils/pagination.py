@@ -0,0 +1,96 @@
+import streamlit as st
+import numpy as np
+
+# Paginated table mode: only the rows of the visible page are copied out
+# of the full DataFrame and sent to the browser. The page position is a
+# keyset cursor (the key of the page's first row) rather than an offset,
+# so a page stays put when rows before it are added or removed. Row
+# selection is kept in session_state by key, so it survives paging.
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+def _state(name):
+    return st.session_state.setdefault(f"_pager_{name}", {"cursor": None, "offset": 0, "selected": set()})
+
+
+def stable_sort(df, by, ascending=True, key="UUID"):
+    """
+    Sort by one column with key as the tie-breaker, so every row has a
+    fixed position that page cursors can rely on.
+    """
+    return df.sort_values(by=[by, key], ascending=[ascending, True], kind="mergesort", na_position="last")
+
+
+def page_window(df, cursor, offset, page_size, key="UUID"):
+    """
+    Return the start position of the page beginning at cursor. Falls back
+    to offset (clamped) when the cursor row is no longer in df.
+    """
+    if cursor is not None:
+        found = np.flatnonzero(df[key].to_numpy() == cursor)
+        if len(found):
+            return int(found[0])
+    last_page_start = max(len(df) - 1, 0) // page_size * page_size
+    return min(max(offset, 0), last_page_start)
+
+
+def paginate(df, name, key="UUID"):
+    """
+    Render page controls for df and return just the visible rows.
+    """
+    state = _state(name)
+    total = len(df)
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 3])
+    with col1:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1, key=f"_pager_{name}_size")
+
+    start = page_window(df, state["cursor"], state["offset"], page_size, key)
+    with col2:
+        if st.button("◀ Previous", key=f"_pager_{name}_prev", disabled=start == 0):
+            start = max(start - page_size, 0)
+    with col3:
+        if st.button("Next ▶", key=f"_pager_{name}_next", disabled=start + page_size >= total):
+            start += page_size
+
+    keys = df[key]
+    state["cursor"] = keys.iat[start] if start < total else None
+    state["offset"] = start
+    with col4:
+        pages = max((total - 1) // page_size + 1, 1)
+        end = min(start + page_size, total)
+        st.caption(f"Page {start // page_size + 1} of {pages} · rows {start + 1 if total else 0}–{end} of {total}")
+
+    return df.iloc[start:start + page_size].copy()
+
+
+def selected_keys(name):
+    return set(_state(name)["selected"])
+
+
+def mark_selected(window, name, key="UUID"):
+    """
+    Set the Select column of a page from the stored selection.
+    """
+    window["Select"] = window[key].isin(_state(name)["selected"])
+    return window
+
+
+def sync_selection(edited, name, key="UUID"):
+    """
+    Fold the Select column of an edited page back into the stored selection.
+    """
+    selected = _state(name)["selected"]
+    for row_key, checked in zip(edited[key], edited["Select"]):
+        if checked:
+            selected.add(row_key)
+        else:
+            selected.discard(row_key)
+
+
+def select_all(keys, name):
+    _state(name)["selected"].update(keys)
+
+
+def clear_selection(name):
+    _state(name)["selected"].clear()
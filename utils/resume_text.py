@@ -0,0 +1,127 @@
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # resume search stays empty until pypdf is installed
+    PdfReader = None
+
+load_dotenv()
+
+# Full-text index over resume contents, kept in its own SQLite file so it
+# works with either storage backend. Text is extracted off the request
+# path by a small thread pool and stored once per resume digest; the FTS5
+# table holds one row per applicant and is ranked with BM25.
+#
+# Run `python -m utils.resume_text` to index every existing resume.
+
+INDEX_FILE = os.environ.get("resume_index_file", "resume_index.db")
+WORKERS = int(os.environ.get("resume_workers", 2))
+
+
+class ResumeTextIndex:
+    def __init__(self, path, workers):
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS texts (digest TEXT PRIMARY KEY, body TEXT NOT NULL)")
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS resume_fts USING fts5("
+            "applicant_id UNINDEXED, body, tokenize='porter unicode61')"
+        )
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="resume-text")
+
+    def _cached_text(self, digest):
+        if not digest:
+            return None
+        with self._lock:
+            row = self._conn.execute("SELECT body FROM texts WHERE digest = ?", (digest,)).fetchone()
+        return row[0] if row else None
+
+    def _extract(self, path):
+        if PdfReader is None or not path or not os.path.exists(path):
+            return None
+        try:
+            reader = PdfReader(path)
+            return "\n".join(page.extract_text() or "" for page in reader.pages)
+        except Exception as e:
+            print(f"Could not extract text from {path}: {e}")
+            return None
+
+    def index_text(self, applicant_id, body, digest=None):
+        """
+        Replace the indexed text of one applicant.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            if digest:
+                self._conn.execute("INSERT OR REPLACE INTO texts (digest, body) VALUES (?, ?)", (digest, body))
+            self._conn.execute("DELETE FROM resume_fts WHERE applicant_id = ?", (applicant_id,))
+            if body and body.strip():
+                self._conn.execute("INSERT INTO resume_fts (applicant_id, body) VALUES (?, ?)", (applicant_id, body))
+
+    def _index(self, applicant_id, path, digest):
+        body = self._cached_text(digest)
+        if body is None:
+            body = self._extract(path)
+            if body is None:
+                return
+        self.index_text(applicant_id, body, digest)
+
+    def schedule(self, applicant_id, path, digest=None):
+        """
+        Extract and index a resume in the background. Identical resumes are
+        only extracted once.
+        """
+        return self._pool.submit(self._index, applicant_id, path, digest)
+
+    def remove(self, applicant_ids):
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany("DELETE FROM resume_fts WHERE applicant_id = ?", [(a,) for a in applicant_ids])
+
+    def search(self, query, limit=50):
+        """
+        Return [(applicant_id, score)] best first for resumes containing
+        every word of query, scored by BM25 (higher is better).
+        """
+        terms = ['"' + term.replace('"', '""') + '"' for term in (query or "").split()]
+        if not terms:
+            return []
+        sql = "SELECT applicant_id, -bm25(resume_fts) FROM resume_fts WHERE resume_fts MATCH ? ORDER BY rank"
+        params = [" ".join(terms)]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+
+resume_index = ResumeTextIndex(INDEX_FILE, WORKERS)
+
+
+def reindex_all():
+    """
+    Queue every applicant resume for indexing and wait for the workers.
+    Returns the number of resumes queued.
+    """
+    from utils.storage import get_backend
+    futures = []
+    for uid, record in (get_backend().get("applicants") or {}).items():
+        if isinstance(record, dict) and record.get("resume_url"):
+            futures.append(resume_index.schedule(uid, record["resume_url"], record.get("resume_hash")))
+    for future in futures:
+        future.result()
+    return len(futures)
+
+
+if __name__ == "__main__":
+    from utils.firebase_helper import init_firebase
+    init_firebase()
+    if PdfReader is None:
+        print("pypdf is not installed; run `pip install pypdf` to extract resume text")
+    else:
+        print(f"Indexed {reindex_all()} resume(s)")
@@ -0,0 +1,139 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+from dotenv import load_dotenv
+from utils.storage import get_backend
+
+load_dotenv()
+
+# Content-addressed resume files. Each distinct upload is stored once as
+#
+#   <resumes_dir>/<first two hex digits>/<sha256>.pdf
+#
+# and applicants keep its digest in resume_hash next to resume_url. The
+# number of applicants using a file is kept in resume_refs/<sha256>; when
+# it drops to zero the file is removed. Run `python -m utils.resumes` to
+# recount references from the applicants and sweep unreferenced files.
+
+RESUMES_DIR = os.environ.get("resumes_dir", "resumes")
+REFS_PATH = "resume_refs"
+CHUNK_SIZE = 1 << 20
+# Unreferenced files younger than this are left alone by the sweep, since
+# they may belong to an upload that has not taken its reference yet.
+SWEEP_GRACE_SECONDS = 3600
+
+_BLOB_NAME = re.compile(r"^[0-9a-f]{64}\.pdf$")
+# Serializes reference changes with the file operations they imply within
+# this process.
+_lock = threading.Lock()
+
+
+def blob_path(digest):
+    return os.path.join(RESUMES_DIR, digest[:2], f"{digest}.pdf")
+
+
+def _adjust(digest, amount):
+    def bump(current):
+        count = (current if isinstance(current, int) else 0) + amount
+        return count if count > 0 else None
+    return get_backend().transaction(f"{REFS_PATH}/{digest}", bump) or 0
+
+
+def store_resume(file):
+    """
+    Stream an uploaded file to disk in chunks while hashing it and take a
+    reference on the result. Returns (digest, path). Identical uploads
+    share one file.
+    """
+    os.makedirs(RESUMES_DIR, exist_ok=True)
+    digest = hashlib.sha256()
+    if hasattr(file, "seek"):
+        file.seek(0)
+    fd, tmp_path = tempfile.mkstemp(dir=RESUMES_DIR, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                out.write(chunk)
+            out.flush()
+            os.fsync(out.fileno())
+        digest = digest.hexdigest()
+        path = blob_path(digest)
+        with _lock:
+            _adjust(digest, 1)
+            if os.path.exists(path):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return digest, path
+
+
+def release_resume(digest):
+    """
+    Drop one reference to a stored resume, deleting the file once no
+    applicant uses it.
+    """
+    if not digest:
+        return
+    with _lock:
+        if _adjust(digest, -1) == 0:
+            try:
+                os.remove(blob_path(digest))
+            except FileNotFoundError:
+                pass
+
+
+def release_legacy_resume(applicant_id, url):
+    """
+    Delete a resume saved by the old uploader as <resumes_dir>/<id>.pdf.
+    Such files have no resume_hash and are not matched by the sweep.
+    """
+    legacy = os.path.join(RESUMES_DIR, f"{applicant_id}.pdf")
+    if url and os.path.normpath(url) == os.path.normpath(legacy):
+        try:
+            os.remove(legacy)
+        except FileNotFoundError:
+            pass
+
+
+def rebuild_refs():
+    """
+    Recount resume references from the applicants and delete files no
+    applicant refers to. Returns (referenced files, removed files).
+    """
+    backend = get_backend()
+    counts = {}
+    for record in (backend.get("applicants") or {}).values():
+        digest = record.get("resume_hash") if isinstance(record, dict) else None
+        if digest:
+            counts[digest] = counts.get(digest, 0) + 1
+    backend.set(REFS_PATH, counts)
+
+    removed = 0
+    now = time.time()
+    for root, _, files in os.walk(RESUMES_DIR):
+        for name in files:
+            path = os.path.join(root, name)
+            stale = now - os.path.getmtime(path) > SWEEP_GRACE_SECONDS
+            if _BLOB_NAME.match(name) and name[:-4] not in counts and stale:
+                os.remove(path)
+                removed += 1
+            elif name.endswith(".part") and stale:
+                # Left behind by an interrupted upload
+                os.remove(path)
+    return len(counts), removed
+
+
+if __name__ == "__main__":
+    from utils.firebase_helper import init_firebase
+    init_firebase()
+    referenced, removed = rebuild_refs()
+    print(f"{referenced} resume(s) referenced, {removed} orphaned file(s) removed")
@@ -0,0 +1,365 @@
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from urllib.parse import unquote
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def split_path(path):
+    return [seg for seg in str(path).split("/") if seg]
+
+
+_KEY_ESCAPES = {c: f"%{ord(c):02X}" for c in "%.$#[]/"}
+
+
+def encode_key(value):
+    """
+    Escape characters that are not allowed in database keys.
+    """
+    return "".join(_KEY_ESCAPES.get(c, c) for c in str(value))
+
+
+def decode_key(key):
+    return unquote(key)
+
+
+def increment(amount):
+    """
+    Server-side increment placeholder usable as a value in set()/update(),
+    matching the Realtime Database ServerValue.increment.
+    """
+    return {".sv": {"increment": amount}}
+
+
+def _increment_amount(value):
+    if isinstance(value, dict) and isinstance(value.get(".sv"), dict):
+        return value[".sv"].get("increment")
+    return None
+
+
+class StorageBackend(ABC):
+    """
+    Interface implemented by every storage engine used by firebase_helper.
+    Paths are slash separated and follow Realtime Database semantics:
+    writing None deletes a node and update() accepts multi-segment keys.
+    """
+
+    @abstractmethod
+    def get(self, path, shallow=False):
+        ...
+
+    @abstractmethod
+    def set(self, path, value):
+        ...
+
+    @abstractmethod
+    def update(self, path, values):
+        ...
+
+    @abstractmethod
+    def delete(self, path):
+        ...
+
+    @abstractmethod
+    def query(self, path, child, equal_to=None, start_at=None):
+        ...
+
+    @abstractmethod
+    def transaction(self, path, update_fn):
+        ...
+
+    def count_by(self, path, child):
+        """
+        Return {value: number of records} for the given child of every
+        record under path, computed in a single pass.
+        """
+        counts = {}
+        for record in (self.get(path) or {}).values():
+            if isinstance(record, dict) and record.get(child) is not None:
+                counts[record[child]] = counts.get(record[child], 0) + 1
+        return counts
+
+
+class FirebaseBackend(StorageBackend):
+    """
+    Realtime Database implementation, a thin wrapper over db.reference().
+    """
+
+    def __init__(self):
+        from firebase_admin import db
+        self._db = db
+
+    def get(self, path, shallow=False):
+        return self._db.reference(path).get(shallow=shallow)
+
+    def set(self, path, value):
+        self._db.reference(path).set(value)
+
+    def update(self, path, values):
+        if values:
+            self._db.reference(path).update(values)
+
+    def delete(self, path):
+        self._db.reference(path).delete()
+
+    def query(self, path, child, equal_to=None, start_at=None):
+        query = self._db.reference(path).order_by_child(child)
+        if equal_to is not None:
+            query = query.equal_to(equal_to)
+        if start_at is not None:
+            query = query.start_at(start_at)
+        return query.get() or {}
+
+    def transaction(self, path, update_fn):
+        return self._db.reference(path).transaction(update_fn)
+
+
+# Top-level nodes stored as real tables; the tuple lists the indexed columns
+# extracted from each record on write.
+SQLITE_TABLES = {
+    "applicants": ("updated_at",),
+    "jobs": ("status",),
+    "applications": ("job_id", "applicant_id"),
+}
+
+SQLITE_INDEXES = [
+    ("applications", "job_id"),
+    ("applications", "applicant_id"),
+    ("jobs", "status"),
+    ("applicants", "updated_at"),
+]
+
+
+def _get_in(value, segs):
+    for seg in segs:
+        if isinstance(value, dict):
+            value = value.get(seg)
+        elif isinstance(value, list) and seg.isdigit() and int(seg) < len(value):
+            value = value[int(seg)]
+        else:
+            return None
+    return value
+
+
+def _set_in(doc, segs, value):
+    """
+    Return a copy of doc with value written at segs, pruning empty parents
+    the way the Realtime Database does.
+    """
+    if not segs:
+        return value
+    if isinstance(doc, list):
+        doc = {str(i): v for i, v in enumerate(doc) if v is not None}
+    doc = dict(doc) if isinstance(doc, dict) else {}
+    child = _set_in(doc.get(segs[0]), segs[1:], value)
+    if child is None or child == {}:
+        doc.pop(segs[0], None)
+    else:
+        doc[segs[0]] = child
+    return doc or None
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    Local single-file engine. applicants, jobs and applications are tables
+    with indexed lookup columns; every other top-level node is stored as a
+    JSON document in the nodes table.
+    """
+
+    def __init__(self, path):
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for table, columns in SQLITE_TABLES.items():
+            cols = "".join(f", {col} TEXT" for col in columns)
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (id TEXT PRIMARY KEY{cols}, data TEXT NOT NULL)")
+        for table, column in SQLITE_INDEXES:
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table} ({column})")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS nodes (key TEXT PRIMARY KEY, data TEXT NOT NULL)")
+
+    # Low-level row access
+
+    def _load_row(self, table, key):
+        if table in SQLITE_TABLES:
+            row = self._conn.execute(f"SELECT data FROM {table} WHERE id = ?", (key,)).fetchone()
+        else:
+            row = self._conn.execute("SELECT data FROM nodes WHERE key = ?", (table,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _store_row(self, table, key, value):
+        if table not in SQLITE_TABLES:
+            if value is None:
+                self._conn.execute("DELETE FROM nodes WHERE key = ?", (table,))
+            else:
+                self._conn.execute("INSERT OR REPLACE INTO nodes (key, data) VALUES (?, ?)", (table, json.dumps(value)))
+            return
+        if value is None:
+            self._conn.execute(f"DELETE FROM {table} WHERE id = ?", (key,))
+            return
+        columns = SQLITE_TABLES[table]
+        indexed = [value.get(col) if isinstance(value, dict) else None for col in columns]
+        placeholders = ", ".join("?" * (len(columns) + 2))
+        self._conn.execute(
+            f"INSERT OR REPLACE INTO {table} (id, {', '.join(columns)}, data) VALUES ({placeholders})",
+            (key, *[None if v is None else str(v) for v in indexed], json.dumps(value)),
+        )
+
+    def _read(self, segs):
+        if not segs:
+            root = {table: self._read([table]) for table in SQLITE_TABLES}
+            for key, data in self._conn.execute("SELECT key, data FROM nodes"):
+                root[key] = json.loads(data)
+            return {k: v for k, v in root.items() if v} or None
+        table = segs[0]
+        if table in SQLITE_TABLES:
+            if len(segs) == 1:
+                rows = self._conn.execute(f"SELECT id, data FROM {table}").fetchall()
+                return {rid: json.loads(data) for rid, data in rows} or None
+            return _get_in(self._load_row(table, segs[1]), segs[2:])
+        return _get_in(self._load_row(table, None), segs[1:])
+
+    def _write(self, segs, value):
+        amount = _increment_amount(value)
+        if amount is not None:
+            current = self._read(segs)
+            value = (current if isinstance(current, (int, float)) else 0) + amount
+        if not segs:
+            self._conn.execute("DELETE FROM nodes")
+            for table in SQLITE_TABLES:
+                self._conn.execute(f"DELETE FROM {table}")
+            for key, child in (value or {}).items():
+                self._write([key], child)
+            return
+        table = segs[0]
+        if table in SQLITE_TABLES:
+            if len(segs) == 1:
+                self._conn.execute(f"DELETE FROM {table}")
+                for key, record in (value or {}).items():
+                    self._store_row(table, key, record)
+                return
+            key, rest = segs[1], segs[2:]
+        else:
+            key, rest = None, segs[1:]
+        current = self._load_row(table, key) if rest else None
+        self._store_row(table, key, _set_in(current, rest, value))
+
+    # StorageBackend interface
+
+    def get(self, path, shallow=False):
+        segs = split_path(path)
+        with self._lock:
+            if shallow and len(segs) == 1 and segs[0] in SQLITE_TABLES:
+                rows = self._conn.execute(f"SELECT id FROM {segs[0]}").fetchall()
+                return {rid: True for (rid,) in rows} or None
+            value = self._read(segs)
+        if shallow and isinstance(value, dict):
+            return {k: True for k in value}
+        return value
+
+    def set(self, path, value):
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._write(split_path(path), value)
+
+    def update(self, path, values):
+        base = split_path(path)
+        # Paths below a single row are grouped so each row is loaded and
+        # stored once however many of its fields change. Multi-path update
+        # paths never overlap, so applying them out of order is safe.
+        rows = {}
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            for key, value in values.items():
+                segs = base + split_path(key)
+                depth = 2 if segs and segs[0] in SQLITE_TABLES else 1
+                if len(segs) > depth:
+                    rows.setdefault((segs[0], segs[1] if depth == 2 else None), []).append((segs[depth:], value))
+                else:
+                    self._write(segs, value)
+            for (table, key), changes in rows.items():
+                current = self._load_row(table, key)
+                for rest, value in changes:
+                    amount = _increment_amount(value)
+                    if amount is not None:
+                        existing = _get_in(current, rest)
+                        value = (existing if isinstance(existing, (int, float)) else 0) + amount
+                    current = _set_in(current, rest, value)
+                self._store_row(table, key, current)
+
+    def delete(self, path):
+        self.set(path, None)
+
+    def query(self, path, child, equal_to=None, start_at=None):
+        segs = split_path(path)
+        with self._lock:
+            if len(segs) == 1 and segs[0] in SQLITE_TABLES:
+                table = segs[0]
+                column = child if child in SQLITE_TABLES[table] else f"json_extract(data, '$.{child}')"
+                sql, args = f"SELECT id, data FROM {table}", []
+                if equal_to is not None:
+                    sql, args = sql + f" WHERE {column} = ?", [equal_to]
+                elif start_at is not None:
+                    sql, args = sql + f" WHERE {column} >= ?", [start_at]
+                rows = self._conn.execute(sql + f" ORDER BY {column}, id", args).fetchall()
+                return {rid: json.loads(data) for rid, data in rows}
+            records = self._read(segs) or {}
+        if isinstance(records, list):
+            records = {str(i): v for i, v in enumerate(records) if v is not None}
+        matches = {
+            key: record for key, record in records.items()
+            if isinstance(record, dict)
+            and (equal_to is None or record.get(child) == equal_to)
+            and (start_at is None or (record.get(child) is not None and record.get(child) >= start_at))
+        }
+        return dict(sorted(matches.items(), key=lambda item: (str(item[1].get(child)), item[0])))
+
+    def transaction(self, path, update_fn):
+        segs = split_path(path)
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            value = update_fn(self._read(segs))
+            self._write(segs, value)
+        return value
+
+    def count_by(self, path, child):
+        segs = split_path(path)
+        if len(segs) == 1 and segs[0] in SQLITE_TABLES and child in SQLITE_TABLES[segs[0]]:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT {child}, COUNT(*) FROM {segs[0]} WHERE {child} IS NOT NULL GROUP BY {child}"
+                ).fetchall()
+            return dict(rows)
+        return super().count_by(path, child)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """
+    Return the process-wide storage backend selected by the storage_backend
+    environment variable ("firebase" by default, or "sqlite").
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if os.environ.get("storage_backend", "firebase").lower() == "sqlite":
+                    _backend = SQLiteBackend(os.environ.get("sqlite_file", "applicant_manager.db"))
+                else:
+                    _backend = FirebaseBackend()
+    return _backend
+
+
+def set_backend(backend):
+    """
+    Replace the process-wide backend, e.g. with a SQLiteBackend for scripts.
+    """
+    global _backend
+    _backend = backend
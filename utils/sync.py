@@ -0,0 +1,169 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from utils.storage import get_backend
+
+load_dotenv()
+
+
+class NodeMirror:
+    """
+    Local mirror of a keyed node that is refreshed incrementally.
+
+    After the first full load only records whose order_key is at or after
+    the sync watermark are fetched, via order_by_child(order_key).start_at().
+    Deletions are picked up from tombstones written to deletions/<path> by
+    the delete helpers, and a periodic shallow key scan catches deletions
+    made outside the app.
+
+    With the Realtime Database backend this needs ".indexOn" rules for
+    order_key on the node and for "deleted_at" on deletions/<path>; if an
+    ordered query is rejected the mirror falls back to full loads.
+    Tombstones older than the reconcile window are pruned, since the key
+    scan catches anything they would have told a slower reader.
+    """
+
+    def __init__(self, path, order_key="updated_at", overlap_seconds=300, reconcile_seconds=3600):
+        self.path = path
+        self.order_key = order_key
+        # Re-read a small window before the watermark so writers with a
+        # slightly lagging clock are not missed.
+        self.overlap = timedelta(seconds=overlap_seconds)
+        self.reconcile_seconds = reconcile_seconds
+        self.records = {}
+        self.version = 0
+        self._watermark = None
+        self._tombstone_watermark = None
+        self._last_reconcile = 0.0
+        self._loaded = False
+        self._delta_failed = False
+        self._lock = threading.Lock()
+        self._listeners = []
+
+    def subscribe(self, listener):
+        """
+        Register listener(updated, removed, reset), called under the mirror
+        lock whenever records change. reset=True means updated holds every
+        record and any previously derived state should be discarded.
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, updated, removed, reset=False):
+        for listener in self._listeners:
+            listener(updated, removed, reset)
+
+    def _rewind(self, stamp):
+        if not stamp:
+            return None
+        try:
+            return (datetime.fromisoformat(stamp) - self.overlap).isoformat()
+        except (TypeError, ValueError):
+            return stamp
+
+    def _latest(self, values, current):
+        stamps = [v for v in values if isinstance(v, str)]
+        if current:
+            stamps.append(current)
+        return max(stamps) if stamps else current
+
+    def _full_load(self, backend):
+        records = backend.get(self.path) or {}
+        tombstones = backend.get(f"deletions/{self.path}") or {}
+        self.records = records
+        self._watermark = self._latest((r.get(self.order_key) for r in records.values()), None)
+        self._tombstone_watermark = self._latest((t.get("deleted_at") for t in tombstones.values()), None)
+        self._last_reconcile = time.monotonic()
+        self._loaded = True
+        self.version += 1
+        self._notify(records, [], reset=True)
+
+    def sync(self):
+        """
+        Bring the mirror up to date and return {key: record}. The returned
+        dict is replaced, never mutated, so it is safe to hand to readers.
+        """
+        backend = get_backend()
+        with self._lock:
+            if not self._loaded or self._delta_failed:
+                self._full_load(backend)
+                return self.records
+
+            try:
+                if self._watermark is not None:
+                    changed = backend.query(self.path, self.order_key, start_at=self._rewind(self._watermark))
+                else:
+                    changed = backend.get(self.path) or {}
+                if self._tombstone_watermark is not None:
+                    deleted = backend.query(f"deletions/{self.path}", "deleted_at", start_at=self._rewind(self._tombstone_watermark))
+                else:
+                    deleted = backend.get(f"deletions/{self.path}") or {}
+            except Exception as e:
+                # Most likely a missing .indexOn rule; stop trying delta queries
+                print(f"Delta sync of {self.path} failed, using full loads instead: {e}")
+                self._delta_failed = True
+                self._full_load(backend)
+                return self.records
+
+            # Tombstones first: a key that was deleted and re-created shows
+            # up in changed as well, and its current record must win.
+            removed = [key for key in deleted if key in self.records and key not in changed]
+            updated = {key: rec for key, rec in changed.items() if self.records.get(key) != rec}
+            if removed or updated:
+                records = dict(self.records)
+                for key in removed:
+                    records.pop(key, None)
+                records.update(updated)
+                self.records = records
+                self.version += 1
+                self._notify(updated, removed)
+
+            self._watermark = self._latest((r.get(self.order_key) for r in changed.values()), self._watermark)
+            self._tombstone_watermark = self._latest((t.get("deleted_at") for t in deleted.values()), self._tombstone_watermark)
+
+            if time.monotonic() - self._last_reconcile > self.reconcile_seconds:
+                self._reconcile(backend)
+            return self.records
+
+    def _reconcile(self, backend):
+        keys = set(backend.get(self.path, shallow=True) or {})
+        self._last_reconcile = time.monotonic()
+        self._prune_tombstones(backend)
+        if keys - set(self.records):
+            # Records without an order_key are invisible to delta queries.
+            self._full_load(backend)
+        elif set(self.records) - keys:
+            removed = list(set(self.records) - keys)
+            self.records = {key: rec for key, rec in self.records.items() if key in keys}
+            self.version += 1
+            self._notify({}, removed)
+
+    def _prune_tombstones(self, backend):
+        cutoff = datetime.now().astimezone() - timedelta(seconds=self.reconcile_seconds) - self.overlap
+        expired = {}
+        for key, tombstone in (backend.get(f"deletions/{self.path}") or {}).items():
+            try:
+                if datetime.fromisoformat(tombstone.get("deleted_at")) < cutoff:
+                    expired[f"deletions/{self.path}/{key}"] = None
+            except (AttributeError, TypeError, ValueError):
+                expired[f"deletions/{self.path}/{key}"] = None
+        if expired:
+            backend.update("/", expired)
+
+    def reset(self):
+        with self._lock:
+            self._loaded = False
+            self._delta_failed = False
+            self.records = {}
+
+
+def delta_sync_enabled():
+    # Opt-in: delta queries need .indexOn rules on the Realtime Database
+    return os.environ.get("applicants_sync", "full").lower() == "delta"
+
+
+applicants_mirror = NodeMirror(
+    "applicants",
+    reconcile_seconds=float(os.environ.get("applicants_reconcile_seconds", 3600)),
+)
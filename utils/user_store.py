@@ -0,0 +1,174 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+from dotenv import load_dotenv
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; fall back to the in-process lock
+    fcntl = None
+
+load_dotenv()
+
+# Failed logins allowed per user before attempts are throttled; each
+# further failure doubles the wait, up to LOCKOUT_MAX_SECONDS.
+FREE_ATTEMPTS = int(os.environ.get("login_free_attempts", 3))
+LOCKOUT_MAX_SECONDS = float(os.environ.get("login_lockout_max", 300))
+
+# bcrypt is deliberately slow; run it on a small pool so a burst of logins
+# queues for a few CPU-bound workers instead of hashing on every core at
+# once. Each login still waits for its own check to finish.
+_bcrypt_pool = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("bcrypt_workers", 2)),
+    thread_name_prefix="bcrypt",
+)
+
+
+class UserStore:
+    """
+    username -> bcrypt hash, stored as a JSON file. Reads are served from
+    memory until the file's mtime or size changes; writes take an exclusive
+    file lock, re-read the file and replace it atomically, so concurrent
+    registrations from several processes are never lost.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._users = {}
+        self._stamp = None
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            return None
+
+    def _read(self):
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def load(self):
+        """
+        Return the current users. The dict is shared and must not be mutated.
+        """
+        with self._lock:
+            stamp = self._stat()
+            if stamp != self._stamp:
+                self._users = self._read()
+                self._stamp = stamp
+            return self._users
+
+    def _write(self, users):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(users, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def add(self, username, password_hash):
+        """
+        Add a user unless the name is taken. Returns False if it was.
+        """
+        with self._lock, open(f"{self.path}.lock", "a") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            users = self._read()
+            if username in users:
+                return False
+            users[username] = password_hash
+            self._write(users)
+            self._users, self._stamp = users, self._stat()
+            return True
+
+
+class LoginThrottle:
+    """
+    Per-user exponential backoff after repeated failed logins. A user's
+    record is forgotten once its lockout has been over for max_seconds,
+    so guessed usernames do not accumulate.
+    """
+
+    def __init__(self, free_attempts, max_seconds):
+        self.free_attempts = free_attempts
+        self.max_seconds = max_seconds
+        self._failures = {}
+        self._last_evict = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _evict(self, now):
+        # Called with the lock held; scans at most once per max_seconds
+        if now - self._last_evict < self.max_seconds:
+            return
+        self._last_evict = now
+        expired = [name for name, (_, until) in self._failures.items() if now - until > self.max_seconds]
+        for name in expired:
+            del self._failures[name]
+
+    def retry_after(self, username):
+        """
+        Seconds until username may try again (0 if it may now).
+        """
+        with self._lock:
+            entry = self._failures.get(username)
+        if not entry:
+            return 0
+        return max(0.0, entry[1] - time.monotonic())
+
+    def failed(self, username):
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            count, until = self._failures.get(username, (0, now))
+            if now - until > self.max_seconds:
+                count = 0
+            count += 1
+            delay = 0 if count <= self.free_attempts else min(2 ** (count - self.free_attempts), self.max_seconds)
+            self._failures[username] = (count, now + delay)
+
+    def succeeded(self, username):
+        with self._lock:
+            self._failures.pop(username, None)
+
+
+user_store = UserStore(os.environ.get("user_file", "users.json"))
+login_throttle = LoginThrottle(FREE_ATTEMPTS, LOCKOUT_MAX_SECONDS)
+# Checked for unknown usernames so they take as long as known ones
+_DUMMY_HASH = bcrypt.hashpw(b"-", bcrypt.gensalt())
+
+
+def hash_password(password):
+    return _bcrypt_pool.submit(bcrypt.hashpw, password.encode("utf-8"), bcrypt.gensalt()).result()
+
+
+def authenticate(username, password):
+    """
+    Check a login. Returns (ok, retry_after): retry_after is non-zero when
+    the user is throttled, in which case the password is not checked.
+    """
+    wait = login_throttle.retry_after(username)
+    if wait:
+        return False, wait
+    stored = user_store.load().get(username)
+    stored_hash = stored.encode("utf-8") if stored else _DUMMY_HASH
+    ok = _bcrypt_pool.submit(bcrypt.checkpw, password.encode("utf-8"), stored_hash).result() and stored is not None
+    if ok:
+        login_throttle.succeeded(username)
+    else:
+        login_throttle.failed(username)
+    return ok, 0
@@ -0,0 +1,63 @@
+# Field rules shared by the add forms and the bulk importer.
+
+WORK_MODES = ["Onsite", "Remote", "Hybrid"]
+WORK_DURATIONS = ["Full Time", "Contractual"]
+JOB_DURATIONS = ["Full Time", "Contractual (6+6)", "Contractual (1 year )", "Internship"]
+SOURCES = ["Job Site", "Referral", "Social Media"]
+JOB_STATUSES = ["open", "closed"]
+
+APPLICANT_REQUIRED = ["name", "phone", "email", "skills", "course", "specialization", "institute"]
+APPLICANT_CHOICES = {
+    "current_mode": WORK_MODES,
+    "preferred_mode": WORK_MODES,
+    "current_duration": WORK_DURATIONS,
+    "preferred_duration": WORK_DURATIONS,
+    "source": SOURCES,
+}
+APPLICANT_NUMBERS = ["experience", "current_ctc", "expected_ctc"]
+
+JOB_REQUIRED = ["job_title", "work_mode", "skills", "vacancies"]
+JOB_CHOICES = {
+    "work_mode": WORK_MODES,
+    "job_duration": JOB_DURATIONS,
+    "status": JOB_STATUSES,
+}
+JOB_NUMBERS = ["experience_required", "vacancies"]
+# Lower bounds beyond "not negative", matching the form inputs
+JOB_MINIMUMS = {"vacancies": 1}
+
+
+def _errors(data, required, choices, numbers, minimums=None):
+    # A numeric 0 is present but out of range; the range checks report it
+    errors = [f"Missing {field}" for field in required if not data.get(field) and data.get(field) != 0]
+    for field, options in choices.items():
+        value = data.get(field)
+        if value and value not in options:
+            errors.append(f"Invalid {field} '{value}' (expected one of {', '.join(options)})")
+    for field in numbers:
+        value = data.get(field)
+        if value in (None, ""):
+            continue
+        try:
+            minimum = (minimums or {}).get(field)
+            if minimum is not None and float(value) < minimum:
+                errors.append(f"{field} must be at least {minimum}")
+            elif float(value) < 0:
+                errors.append(f"{field} must not be negative")
+        except (TypeError, ValueError):
+            errors.append(f"{field} must be a number, got '{value}'")
+    return errors
+
+
+def validate_applicant(data):
+    """
+    Return a list of problems with an applicant record (empty if valid).
+    """
+    return _errors(data, APPLICANT_REQUIRED, APPLICANT_CHOICES, APPLICANT_NUMBERS)
+
+
+def validate_job(data):
+    """
+    Return a list of problems with a job record (empty if valid).
+    """
+    return _errors(data, JOB_REQUIRED, JOB_CHOICES, JOB_NUMBERS, JOB_MINIMUMS)